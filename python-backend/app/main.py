@@ -2,10 +2,14 @@
 MessageAI Backend API
 FastAPI application for AI-powered messaging features
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
+from logging.handlers import QueueHandler, QueueListener
+import logging
 import os
+import queue
 
 # Load environment variables
 load_dotenv()
@@ -19,13 +23,66 @@ if missing_vars:
         "Please check your .env file."
     )
 
+
+def start_queue_logging() -> QueueListener:
+    """
+    Route root-logger records through a queue so formatting and stream writes
+    happen on a background thread instead of the request path
+    
+    Returns:
+        Running listener; stop it to flush and restore the original handlers
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    if not handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        handlers = [handler]
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.setLevel(logging.DEBUG if os.getenv("DEBUG", "").lower() == "true" else logging.INFO)
+    
+    log_queue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def stop_queue_logging(listener: QueueListener) -> None:
+    """Flush queued records and put the original handlers back on the root logger"""
+    listener.stop()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    for handler in listener.handlers:
+        root.addHandler(handler)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start queued logging and preload shared services so the first request doesn't pay their init cost"""
+    from app.services.openai_service import get_openai_service
+    
+    log_listener = start_queue_logging()
+    openai_service = get_openai_service()
+    try:
+        yield
+    finally:
+        await openai_service.aclose()
+        get_openai_service.cache_clear()
+        stop_queue_logging(log_listener)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="MessageAI Backend",
     description="AI-Powered Messaging Features API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS for iOS app
@@ -3,12 +3,14 @@ Analysis Routes
 Handles comprehensive message analysis including event detection, reminders, decisions, etc.
 """
 from fastapi import APIRouter, HTTPException
+import logging
 from app.models.requests import MessageAnalysisRequest
 from app.models.responses import MessageAnalysisResponse, CalendarDetection, ReminderDetection, DecisionDetection, RSVPDetection, PriorityDetection, ConflictDetection, ConflictEvent
 from app.services.openai_service import get_openai_service
 from app.services.vector_store import get_vector_store
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 @router.post("/analyze-message", response_model=MessageAnalysisResponse)
@@ -28,7 +30,7 @@ async def analyze_message(request: MessageAnalysisRequest):
         # This enables context-aware decision detection
         conversation_context = []
         try:
-            conversation_context = vector_store.search_similar_messages(
+            conversation_context = await vector_store.search_similar_messages_async(
                 query=request.text,
                 k=5,
                 filter_dict={"conversation_id": request.conversation_id}
@@ -42,17 +44,15 @@ async def analyze_message(request: MessageAnalysisRequest):
         expanded_text = openai_service._expand_time_acronyms(request.text)
         
         # Step 3: Analyze message with GPT-4o-mini (with context if available)
-        analysis = openai_service.analyze_message_comprehensive(
+        analysis = await openai_service.analyze_message_comprehensive_async(
             text=expanded_text,  # Use expanded text for better AI understanding
             message_timestamp=request.timestamp,  # Pass message timestamp for date calculations
             user_calendar=request.user_calendar,
             conversation_context=conversation_context,  # RAG context
-            user_id=request.user_id  # Pass user_id for conflict detection (Story 5.6)
+            user_id=request.user_id,  # Pass user_id for conflict detection (Story 5.6)
+            stream=True  # Stop reading as soon as the tool call's JSON closes
         )
         
-        # Generate embedding for the message
-        embedding = openai_service.generate_embedding(request.text)
-        
         # Store message embedding in vector store for future semantic search
         metadata = {
             "user_id": request.user_id,
@@ -62,7 +62,7 @@ async def analyze_message(request: MessageAnalysisRequest):
             "has_decision": analysis["decision"]["detected"]
         }
         
-        vector_store.add_message(
+        await vector_store.add_message_async(
             message_id=request.message_id,
             text=request.text,
             metadata=metadata
@@ -114,9 +114,7 @@ async def analyze_message(request: MessageAnalysisRequest):
         return response
         
     except Exception as e:
-        print(f"Error analyzing message: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error analyzing message: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to analyze message: {str(e)}")
 
 
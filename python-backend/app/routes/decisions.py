@@ -6,6 +6,7 @@ NOTE: Firestore storage happens on iOS client (DecisionService).
 Backend only handles Pinecone vector embeddings for semantic search.
 """
 from fastapi import APIRouter, HTTPException
+import logging
 from app.models.requests import DecisionCreateRequest, DecisionSearchRequest
 from app.models.responses import (
     DecisionCreateResponse,
@@ -15,6 +16,7 @@ from app.models.responses import (
 from app.services.vector_store import get_vector_store
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 @router.post("/decisions/vector", response_model=DecisionCreateResponse)
@@ -29,7 +31,7 @@ async def store_decision_vector(request: DecisionCreateRequest):
         vector_store = get_vector_store()
         
         # Store in Pinecone for semantic search
-        vector_store.add_decision(
+        await vector_store.add_decision_async(
             decision_id=request.decisionId,
             text=request.text,
             metadata={
@@ -49,8 +51,7 @@ async def store_decision_vector(request: DecisionCreateRequest):
         
     except Exception as e:
         # Error storing decision vector, continue without indexing
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error storing decision vector: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -73,7 +74,7 @@ async def search_decisions(
             filter_dict['conversation_id'] = conversation_id
         
         # Search using Pinecone
-        results = vector_store.search_similar_decisions(
+        results = await vector_store.search_similar_decisions_async(
             query=query,
             k=k,
             filter_dict=filter_dict
@@ -82,22 +83,21 @@ async def search_decisions(
         # Convert to response format
         search_results = []
         for result in results:
-            metadata = result['metadata']
+            metadata = result.metadata
             search_results.append(DecisionSearchResult(
                 decisionId=metadata['decision_id'],
-                text=result['content'],
+                text=result.content,
                 conversationId=metadata['conversation_id'],
                 messageId=metadata['message_id'],
                 timestamp=metadata['timestamp'],
-                similarity=result['similarity']
+                similarity=result.similarity
             ))
         
         return DecisionSearchResponse(results=search_results)
         
     except Exception as e:
         # Error searching decisions, return empty results
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error searching decisions: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -117,8 +117,7 @@ async def delete_decision_vector(decision_id: str):
         
     except Exception as e:
         # Error deleting decision vector, continue
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error deleting decision vector: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
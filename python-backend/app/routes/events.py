@@ -2,13 +2,17 @@
 Event Routes
 Handles event creation, indexing and conflict detection
 """
+import time
+import uuid
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
+import logging
 from app.services.event_indexing_service import get_event_indexing_service
 from app.models.requests import EventCreateRequest
 from app.models.responses import EventCreateResponse
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 @router.post("/events/create", response_model=EventCreateResponse)
@@ -20,12 +24,10 @@ async def create_event(request: EventCreateRequest):
     If found, suggests linking to existing event.
     Otherwise, creates new event and stores embedding for future deduplication.
     """
-    import time
     route_start = time.time()
     
     try:
         # Get services
-        import uuid
         event_service = get_event_indexing_service()
         
         # Create search query for deduplication (title + date)
@@ -69,7 +71,7 @@ async def create_event(request: EventCreateRequest):
             raise HTTPException(status_code=500, detail="Failed to index event")
         
         total_route_time = time.time() - route_start
-        print(f"🚀 Total route time: {total_route_time:.3f}s")
+        logger.debug("Total route time: %.3fs", total_route_time)
         
         return EventCreateResponse(
             success=True,
@@ -80,9 +82,7 @@ async def create_event(request: EventCreateRequest):
         )
         
     except Exception as e:
-        print(f"Error creating event: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error creating event: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to create event: {str(e)}")
 
 
@@ -5,10 +5,12 @@ Handles reminder vector storage and semantic search
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import Optional
+import logging
 from app.services.openai_service import get_openai_service
 from app.services.vector_store import get_vector_store
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 class ReminderVectorRequest(BaseModel):
@@ -64,7 +66,7 @@ async def store_reminder_vector(request: ReminderVectorRequest):
         vector_store = get_vector_store()
         
         # Generate embedding for reminder title
-        embedding = openai_service.generate_embedding(request.title)
+        embedding = await openai_service.generate_embedding_async(request.title)
         
         # Store in Pinecone with metadata
         metadata = {
@@ -79,7 +81,7 @@ async def store_reminder_vector(request: ReminderVectorRequest):
         
         vector_store.add_vector(
             vector_id=request.reminder_id,
-            embedding=embedding,
+            embedding=embedding.tolist(),
             metadata=metadata,
             namespace="reminders"
         )
@@ -91,7 +93,7 @@ async def store_reminder_vector(request: ReminderVectorRequest):
         )
         
     except Exception as e:
-        print(f"Error storing reminder vector: {e}")
+        logger.error("Error storing reminder vector: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to store reminder vector: {str(e)}")
 
 
@@ -108,11 +110,11 @@ async def search_reminders(query: str, user_id: str, limit: int = 10):
         vector_store = get_vector_store()
         
         # Generate embedding for search query
-        query_embedding = openai_service.generate_embedding(query)
+        query_embedding = await openai_service.generate_embedding_async(query)
         
         # Search in Pinecone
         search_results = vector_store.search_vectors(
-            query_embedding=query_embedding,
+            query_embedding=query_embedding.tolist(),
             namespace="reminders",
             filter_dict={"user_id": user_id},
             top_k=limit
@@ -133,7 +135,7 @@ async def search_reminders(query: str, user_id: str, limit: int = 10):
         return ReminderSearchResponse(results=results)
         
     except Exception as e:
-        print(f"Error searching reminders: {e}")
+        logger.error("Error searching reminders: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to search reminders: {str(e)}")
 
 
@@ -161,7 +163,7 @@ async def delete_reminder_vector(reminder_id: str):
         )
         
     except Exception as e:
-        print(f"Error deleting reminder vector: {e}")
+        logger.error("Error deleting reminder vector: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to delete reminder vector: {str(e)}")
 
 
@@ -2,9 +2,14 @@
 Summarization Routes
 Handles conversation summarization
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+import logging
+from app.models.requests import ConversationSummarizationRequest
+from app.services.openai_service import get_openai_service
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 @router.post("/summarize/conversation")
@@ -19,4 +24,37 @@ async def summarize_conversation():
     }
 
 
-
+@router.post("/summarize/conversation/stream")
+async def summarize_conversation_stream(request: ConversationSummarizationRequest):
+    """
+    Stream a conversation summary as plain text while it is generated,
+    so interactive clients can render the first words right away
+    """
+    transcript = "\n".join(
+        f"{message.get('user_id', 'User')}: {message.get('text', '')}" for message in request.messages
+    )
+    openai_service = get_openai_service()
+    fragments = openai_service.summarize_text_stream(transcript, request.max_length or 100)
+    
+    # Wait for the first fragment so a failed model call still gets an error status
+    try:
+        first = await fragments.__anext__()
+    except StopAsyncIteration:
+        first = ""
+    except Exception as e:
+        logger.exception("Error summarizing conversation: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    async def body():
+        try:
+            if first:
+                yield first
+            async for fragment in fragments:
+                yield fragment
+        except Exception as e:
+            # Headers are already sent; log and end the truncated response
+            logger.exception("Conversation summary stream failed: %s", e)
+        finally:
+            await fragments.aclose()
+    
+    return StreamingResponse(body(), media_type="text/plain; charset=utf-8")
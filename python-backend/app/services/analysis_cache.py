@@ -0,0 +1,178 @@
+"""
+Analysis Cache
+In-process and shared Redis cache of model extractions for comprehensive message analysis
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+import logging
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    from json import dumps as json_dumps, loads as json_loads
+
+try:
+    import redis
+    import redis.asyncio as redis_asyncio
+except ImportError:  # Redis is optional; the cache is disabled without it
+    redis = None
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+# Default lifetime of a cached extraction
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+# Default number of extractions kept in the per-process LRU tier
+DEFAULT_MEMORY_ENTRIES = 10_000
+
+
+class AnalysisCache:
+    """
+    Two-tier cache for normalized analysis extractions: a per-process LRU checked
+    first, then Redis when configured. Fails open: any Redis error is logged and
+    treated as a cache miss.
+    """
+    
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        memory_entries: Optional[int] = None
+    ):
+        """
+        Connect to Redis when configured
+        
+        Args:
+            url: Redis URL (defaults to REDIS_URL; Redis tier disabled when unset)
+            ttl_seconds: Expiry for cached entries
+            memory_entries: Size of the in-process tier (defaults to ANALYSIS_CACHE_SIZE; 0 disables)
+        """
+        url = url or os.getenv("REDIS_URL")
+        self.ttl_seconds = ttl_seconds
+        if memory_entries is None:
+            memory_entries = int(os.getenv("ANALYSIS_CACHE_SIZE", str(DEFAULT_MEMORY_ENTRIES)))
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, Tuple[float, Union[bytes, str]]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._client = None
+        self._async_client = None
+        if url and redis is not None:
+            self._client = redis.Redis.from_url(url)
+            self._async_client = redis_asyncio.Redis.from_url(url)
+        elif url:
+            logger.warning("REDIS_URL is set but the redis package is not installed; analysis cache disabled")
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether a Redis backend is configured"""
+        return self._client is not None
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a cached extraction
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached extraction or None on miss
+        """
+        raw = self._memory_get(key)
+        if raw is not None:
+            return json_loads(raw)
+        if self._client is None:
+            return None
+        try:
+            raw = self._client.get(key)
+        except Exception as e:
+            logger.warning("Analysis cache read failed: %s", e)
+            return None
+        if not raw:
+            return None
+        self._memory_set(key, raw)
+        return json_loads(raw)
+    
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store an extraction with the configured TTL
+        
+        Args:
+            key: Cache key
+            value: JSON-serializable extraction
+        """
+        raw = json_dumps(value)
+        self._memory_set(key, raw)
+        if self._client is None:
+            return
+        try:
+            self._client.setex(key, self.ttl_seconds, raw)
+        except Exception as e:
+            logger.warning("Analysis cache write failed: %s", e)
+    
+    async def get_async(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of get
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached extraction or None on miss
+        """
+        raw = self._memory_get(key)
+        if raw is not None:
+            return json_loads(raw)
+        if self._async_client is None:
+            return None
+        try:
+            raw = await self._async_client.get(key)
+        except Exception as e:
+            logger.warning("Analysis cache read failed: %s", e)
+            return None
+        if not raw:
+            return None
+        self._memory_set(key, raw)
+        return json_loads(raw)
+    
+    async def set_async(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Async variant of set
+        
+        Args:
+            key: Cache key
+            value: JSON-serializable extraction
+        """
+        raw = json_dumps(value)
+        self._memory_set(key, raw)
+        if self._async_client is None:
+            return
+        try:
+            await self._async_client.setex(key, self.ttl_seconds, raw)
+        except Exception as e:
+            logger.warning("Analysis cache write failed: %s", e)
+    
+    def _memory_get(self, key: str) -> Optional[Union[bytes, str]]:
+        """Serialized extraction from the in-process tier, or None if absent or expired"""
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return entry[1]
+    
+    def _memory_set(self, key: str, raw: Union[bytes, str]) -> None:
+        """Insert into the in-process tier, evicting the least recently used entry when full"""
+        if self.memory_entries <= 0:
+            return
+        with self._memory_lock:
+            self._memory[key] = (time.monotonic() + self.ttl_seconds, raw)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
@@ -0,0 +1,82 @@
+"""
+Embedding Cache
+Content-addressed on-disk cache of embedding vectors (SQLite, float32 blobs)
+"""
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Tuple
+import logging
+
+import numpy as np
+import numpy.typing as npt
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps bound parameters per statement (999 on older builds)
+_MAX_QUERY_PARAMS = 900
+
+
+class EmbeddingDiskCache:
+    """
+    Persistent embedding cache shared across restarts and worker processes.
+    Keys are content hashes of (model, text); values are float32 vectors.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache database
+        
+        Args:
+            path: SQLite database file path
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+    
+    def get_many(self, keys: List[str]) -> Dict[str, npt.NDArray[np.float32]]:
+        """
+        Look up several keys at once
+        
+        Args:
+            keys: Cache keys to fetch
+        
+        Returns:
+            Read-only float32 vectors by key (missing keys are absent)
+        """
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _MAX_QUERY_PARAMS):
+                chunk = keys[start:start + _MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+    
+    def put_many(self, items: Iterable[Tuple[str, npt.ArrayLike]]) -> None:
+        """
+        Store several vectors
+        
+        Args:
+            items: (key, vector) pairs
+        """
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+            self._conn.commit()
+    
+    def clear(self) -> None:
+        """Delete all cached vectors"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
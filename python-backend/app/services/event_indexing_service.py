@@ -2,12 +2,17 @@
 Event Indexing Service
 Handles indexing events in Pinecone for conflict detection and similarity search
 """
+import asyncio
+import time
+import traceback
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from functools import lru_cache
 import os
 from langchain_openai import OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
 from pinecone import Pinecone
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,22 +23,24 @@ class EventIndexingService:
     
     def __init__(self):
         """Initialize Pinecone connection and embedding model"""
-        # Initialize Pinecone client
-        self.pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+        # Initialize Pinecone client (pool_threads sizes its shared connection pool)
+        self.pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"), pool_threads=4)
         
         # Connect to the events index
         self.index_name = "events"
         self.index = self.pc.Index(self.index_name)
         
         # Initialize OpenAI embeddings
+        dimensions = os.getenv("EMBEDDING_DIMENSIONS")
         self.embeddings = OpenAIEmbeddings(
             model="text-embedding-3-small",
+            dimensions=int(dimensions) if dimensions else None,
             openai_api_key=os.getenv("OPENAI_API_KEY")
         )
         
-        # Create events vector store
-        self.events_store = PineconeVectorStore.from_existing_index(
-            index_name=self.index_name,
+        # Create events vector store on the same index handle, so it shares this client's connections
+        self.events_store = PineconeVectorStore(
+            index=self.index,
             embedding=self.embeddings
         )
     
@@ -47,7 +54,6 @@ class EventIndexingService:
         Returns:
             bool: True if successful, False otherwise
         """
-        import time
         start_time = time.time()
         
         try:
@@ -156,19 +162,19 @@ class EventIndexingService:
             similar_events = []
             same_event_detected = False
             
-            for event_data in time_conflicts:
+            # Embed the detected event and every time conflict in one batched request
+            embeddings = []
+            if time_conflicts:
+                texts = [self._create_event_text(detected_event)]
+                texts.extend(self._create_event_text(event_data) for event_data in time_conflicts)
+                embeddings = self.embeddings.embed_documents(texts)
+            detected_embedding = embeddings[0] if embeddings else None
+            
+            for event_data, existing_embedding in zip(time_conflicts, embeddings[1:]):
                 event_id = event_data["event_id"]
                 title = event_data["title"]
                 
                 # Calculate semantic similarity between detected event and existing event
-                detected_text = self._create_event_text(detected_event)
-                existing_text = self._create_event_text(event_data)
-                
-                # Create embeddings for both events
-                detected_embedding = self.embeddings.embed_query(detected_text)
-                existing_embedding = self.embeddings.embed_query(existing_text)
-                
-                # Calculate cosine similarity
                 similarity = self._calculate_cosine_similarity(detected_embedding, existing_embedding)
                 
                 # Create conflict object with full details
@@ -207,7 +213,6 @@ class EventIndexingService:
             
         except Exception as e:
             logger.error(f"❌ Conflict search failed: {e}")
-            import traceback
             logger.error(traceback.format_exc())
             return {
                 "has_conflicts": False,
@@ -304,8 +309,6 @@ class EventIndexingService:
         Returns:
             Dictionary with duplicate check results and indexing status
         """
-        import time
-        import asyncio
         start_time = time.time()
         
         try:
@@ -502,7 +505,6 @@ class EventIndexingService:
             
         except Exception as e:
             logger.error(f"❌ Time conflict search failed: {e}")
-            import traceback
             logger.error(traceback.format_exc())
             return []
     
@@ -545,8 +547,6 @@ class EventIndexingService:
         Calculate cosine similarity between two embeddings
         """
         try:
-            import numpy as np
-            
             # Convert to numpy arrays
             vec1 = np.array(embedding1)
             vec2 = np.array(embedding2)
@@ -583,11 +583,7 @@ class EventIndexingService:
 
 
 # Singleton instance
-_event_indexing_service = None
-
+@lru_cache(maxsize=1)
 def get_event_indexing_service() -> EventIndexingService:
     """Get singleton instance of the event indexing service"""
-    global _event_indexing_service
-    if _event_indexing_service is None:
-        _event_indexing_service = EventIndexingService()
-    return _event_indexing_service
+    return EventIndexingService()
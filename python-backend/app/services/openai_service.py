@@ -2,13 +2,684 @@
 OpenAI Service
 Handles direct OpenAI API interactions for chat completions and embeddings
 """
-from openai import OpenAI
+from openai import (
+    NOT_GIVEN, OpenAI, AsyncOpenAI, APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+)
+from openai.types.chat import ChatCompletion, ChatCompletionMessage
+import asyncio
+import base64
+import copy
 import os
-from typing import List, Dict, Any, Optional
+import re
+import sys
+import hashlib
+import importlib.util
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, AsyncIterator, FrozenSet, Optional, Set, Tuple
 import logging
 
+from dateparser.date import DateDataParser
+import httpx
+import numpy as np
+import numpy.typing as npt
+try:
+    from orjson import dumps as json_dumps, loads as json_loads, JSONDecodeError
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    import json
+    from json import loads as json_loads, JSONDecodeError
+    
+    def json_dumps(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes like orjson.dumps"""
+        return json.dumps(obj).encode("utf-8")
+
+from tenacity import (
+    RetryCallState, before_sleep_log, retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+)
+
+from app.services.event_indexing_service import get_event_indexing_service
+from app.services.analysis_cache import AnalysisCache
+from app.services.embedding_cache import EmbeddingDiskCache
+from app.services.rate_limiter import RateLimiter, estimate_tokens
+from app.services.semantic_cache import SemanticAnalysisCache
+
 logger = logging.getLogger(__name__)
 
+# dateparser settings shared by every call (read-only); per-call keys are layered on top
+_DATEPARSER_SETTINGS = MappingProxyType({
+    'RETURN_AS_TIMEZONE_AWARE': False
+})
+
+# Parsers used for calendar date expressions (relative + absolute, no freshness heuristics)
+_CALENDAR_PARSERS = ('relative-time', 'absolute-time', 'timestamp')
+
+# Fixed-offset relative dates answered without dateparser (days from the reference time)
+_RELATIVE_DAY_OFFSETS = {
+    "now": 0, "today": 0, "this week": 0, "this month": 0,
+    "tomorrow": 1, "day after tomorrow": 2, "the day after tomorrow": 2,
+    "yesterday": -1, "next week": 7,
+}
+_WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+_WEEKDAY_INDEX = {day: index for index, day in enumerate(_WEEKDAYS)}
+
+# Expressions that can't be dates and are rejected before dateparser (empty or
+# punctuation-only strings and overlong text otherwise cost a full parser scan)
+_MAX_DATE_EXPRESSION_LENGTH = 80
+_NO_WORD_RE = re.compile(r'\W*')
+
+# Span inside "in ..." / "... from now", e.g. "3 days", "a week"
+_RELATIVE_SPAN_RE = re.compile(r'(\d{1,3}|a) (day|week)s?')
+
+# Words that mark when a decision was made, e.g. "yesterday we decided ..."
+_TEMPORAL_INDICATORS = frozenset({"yesterday", "today", "earlier", "just now", "recently", "earlier today"})
+
+# Single-pass scans (longest alternatives first so "earlier today" beats "earlier")
+_TEMPORAL_INDICATOR_RE = re.compile(
+    r'\b(' + '|'.join(sorted(map(re.escape, _TEMPORAL_INDICATORS), key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+# Words in an RSVP status that indicate the response was given in the past (substring match)
+_RSVP_TEMPORAL_RE = re.compile(r'yesterday|earlier|just now', re.IGNORECASE)
+
+# Time and urgency acronyms expanded before analysis, keyed by lowercase acronym
+_ACRONYM_EXPANSIONS = {
+    # Business time acronyms
+    'eod': 'end of day',
+    'eob': 'end of business',
+    'cob': 'close of business',
+    'eow': 'end of week',
+    'eoq': 'end of quarter',
+    'eoy': 'end of year',
+    
+    # Urgency acronyms
+    'asap': 'as soon as possible',
+    'urgent': 'urgent',
+}
+_ACRONYM_RE = re.compile(r'\b(' + '|'.join(map(re.escape, _ACRONYM_EXPANSIONS)) + r')\b', re.IGNORECASE)
+
+_DEADLINE_RE = re.compile(r'\b(by|before|until|deadline|due)\s+([^,\.]+)', re.IGNORECASE)
+
+# Temporal, directive, decision/RSVP and urgency cues; a message with none of them
+# can skip the model when the keyword gate is enabled (ANALYSIS_KEYWORD_GATE)
+_TRIGGER_RE = re.compile(
+    r"\b(?:at|by|before|until|due|deadline|today|tonight|tomorrow|yesterday|week|weekend|month|"
+    r"morning|afternoon|evening|noon|midnight|"
+    r"mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun|(?:mon|tues|wednes|thurs|fri|satur|sun)day|"
+    r"let[\u2019']?s|should|remind|forget|meet|meeting|call|schedule|"
+    r"decided?|agreed?|going|rsvp|accept|decline|attend|join|"
+    r"urgent|asap|eod|eob|cob|eow|important)\b"
+    r"|\d{1,2}(?::\d{2})?\s?[ap]\.?m\b|\d{1,2}:\d{2}|\d{1,2}/\d{1,2}",
+    re.IGNORECASE
+)
+
+# Known enum-like values returned by the model; parsed JSON strings are swapped for
+# these interned copies so results share one allocation per value
+_INTERNED_VALUES = {
+    value: sys.intern(value)
+    for value in ("positive", "negative", "neutral", "high", "medium", "low", "accepted", "declined")
+}
+
+# Transient API failures worth retrying (429, 5xx, timeouts, dropped connections)
+_RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+_MAX_RETRY_AFTER_SECONDS = 60.0
+_BACKOFF = wait_random_exponential(min=1, max=30)
+
+# Completion tokens budgeted for rate limiting when a call sets no max_tokens
+_COMPLETION_TOKEN_RESERVE = 512
+
+# Prompt token budgets for RAG context and calendar listings in comprehensive analysis
+_MAX_CONTEXT_TOKENS = 4000
+_MAX_CALENDAR_TOKENS = 1000
+
+# "HH:MM" for every minute of the day, indexed by minutes since midnight
+_CLOCK_TIMES = tuple(f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(24 * 60))
+
+# Default deadline offset for high-priority messages without an explicit deadline
+_ONE_HOUR = timedelta(hours=1)
+
+# 12-hour clock times ("7pm", "4:44 PM", "7 a.m."), matched against lowercased input
+_TIME_RE = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)')
+
+# Exact named times, resolved without dateparser
+_NAMED_TIMES = {
+    'noon': '12:00',
+    'midnight': '00:00',
+    'morning': '09:00',
+    'afternoon': '15:00',
+    'evening': '19:00',
+    'night': '20:00',
+    'late': '22:00',
+    'early': '08:00'
+}
+# Fallback order for named times inside compound phrases ("in the evening")
+_NAMED_TIME_PRIORITY = ('evening', 'morning', 'afternoon', 'night', 'late', 'early', 'noon', 'midnight')
+
+# Per-request token cap of the embeddings endpoint (kept under the 300k limit)
+_MAX_EMBEDDING_REQUEST_TOKENS = 290_000
+
+# Maximum number of embeddings kept in the in-process cache
+_EMBEDDING_CACHE_SIZE = 8192
+
+# Connection pools for the OpenAI clients (HTTP/2 multiplexing when the h2 package is installed)
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Static instructions for comprehensive analysis. Kept byte-identical across calls
+# (date, context, calendar and message all go in the user message) so the prefix is
+# eligible for OpenAI's automatic prompt caching.
+_ANALYSIS_SYSTEM_PROMPT = """You are an AI assistant that analyzes messages for important information.
+
+IMPORTANT DISTINCTIONS:
+- **Events** are scheduled activities involving other people or social gatherings. Examples: "Dinner Friday at 7pm", "Arcade tonight at 7pm"
+- **Reminders** are personal tasks or commitments (even with specific times). Examples: "Send docs by Friday", "Call mom at 3pm"
+- **Decisions** are group agreements with NO time constraints. Example: "Let's go to Italian restaurant"
+
+CALENDAR EVENT DETECTION RULES:
+1. If message contains a TIME + LOCATION/ACTIVITY → ALWAYS detect as calendar event
+2. If message contains "tonight", "today", "tomorrow" + activity → ALWAYS detect as calendar event
+3. If message contains "Let's", "We should", "Want to" + time → ALWAYS detect as calendar event
+   - "Coffee tomorrow morning" → CALENDAR EVENT
+   - "Let's go to the arcade tonight at 7pm" → CALENDAR EVENT
+
+CRITICAL DATE/TIME PARSING RULES:
+Your job is to EXTRACT temporal expressions, NOT calculate dates.
+- "Let's meet tomorrow at 7pm" → date_expression="tomorrow", startTime="19:00", endTime=null
+- "Meeting 2pm to 4pm" → startTime="14:00", endTime="16:00"
+- Keep "next"/"this" exactly as written ("next Tuesday" is NOT "this Tuesday")
+- "tonight" / "this evening" → date_expression="today"
+- If endTime is NOT mentioned, leave it null. Backend will apply 1-hour default automatically.
+DO NOT calculate actual dates - just extract the expression and time!
+
+COMMON TIME ACRONYMS (already expanded in input):
+- EOD/end of day → 11:59 PM; EOB/end of business → 5:00 PM
+- ASAP/as soon as possible → 1 hour from now; EOW/end of week → Friday 5:00 PM
+
+TEMPORAL CONTEXT EXTRACTION:
+- **Decisions**: when the decision was made ("yesterday we decided")
+- **RSVP**: response timing ("I'm in for Friday")
+- **Priority**: urgency deadlines ("need by EOD")
+- **Conflicts**: when conflicts occur ("conflicts with my 3pm meeting")
+- **Calendar Conflicts**: If CALENDAR is provided, check for time overlaps with existing events
+- **Same Event Detection**: If event titles are similar (>70%) and times overlap, it's likely the same event
+- **Alternative Suggestions**: If conflicts exist, suggest nearby available times
+
+SENTIMENT AND KEY POINTS:
+- **Sentiment**: Overall sentiment (positive/negative/neutral), confidence 0.0-1.0, and any emotions expressed
+- **Key Points**: The main points of the message as short phrases
+
+INPUT FORMAT:
+The user message gives CURRENT_DATE and CURRENT_TIME, then optionally RECENT_CONTEXT (recent conversation messages) and CALENDAR (the user's existing calendar events), then the MESSAGE to analyze.
+
+Analyze the message and call the analyze_message tool to return structured results."""
+
+# Tool schema for structured analysis output (shared across calls; never mutated)
+_ANALYZE_FUNCTION = {
+    "name": "analyze_message",
+    "description": "Analyze a message for events, reminders, decisions, RSVP, priority, and conflicts",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "calendar": {
+                "type": "object",
+                "description": "Calendar event detection",
+                "properties": {
+                    "detected": {"type": "boolean", "description": "Whether a calendar event was detected"},
+                    "title": {"type": "string", "description": "Event title", "nullable": True},
+                    "date_expression": {"type": "string", "description": "Temporal expression as-is from message", "nullable": True},
+                    "startTime": {"type": "string", "description": "Start time in HH:MM format (24-hour). Examples: 'noon'->12:00, '7pm'->19:00, '4:44pm'->16:44, 'midnight'->00:00; defaults: morning 09:00, afternoon 15:00, evening 19:00", "nullable": True},
+                    "endTime": {"type": "string", "description": "End time in HH:MM format (24-hour). If not specified, leave null to apply 1-hour default", "nullable": True},
+                    "location": {"type": "string", "description": "Event location", "nullable": True},
+                    "is_invitation": {"type": "boolean", "description": "Whether contains invitation language: inclusive ('Let's', 'We should', 'How about'), participation ('Join us', 'Meet me'), a question ('Want to grab coffee?') or a social gathering ('Party', 'Hang out'). False for statements like 'I have a meeting tomorrow at 2pm'"}
+                },
+                "required": ["detected", "is_invitation"]
+            },
+            "reminder": {
+                "type": "object",
+                "description": "Reminder detection",
+                "properties": {
+                    "detected": {"type": "boolean", "description": "Whether a reminder was detected"},
+                    "title": {"type": "string", "description": "Reminder title", "nullable": True},
+                    "date_expression": {"type": "string", "description": "Due date expression", "nullable": True}
+                },
+                "required": ["detected"]
+            },
+            "decision": {
+                "type": "object",
+                "description": "Decision detection",
+                "properties": {
+                    "detected": {"type": "boolean", "description": "Whether a decision was detected"},
+                    "text": {"type": "string", "description": "Complete decision statement", "nullable": True},
+                    "temporal_context": {"type": "string", "description": "When the decision was made (e.g., 'yesterday', 'earlier today')", "nullable": True}
+                },
+                "required": ["detected"]
+            },
+            "rsvp": {
+                "type": "object",
+                "description": "RSVP detection",
+                "properties": {
+                    "detected": {"type": "boolean", "description": "Whether an RSVP was detected"},
+                    "status": {"type": "string", "description": "RSVP status (accepted/declined)", "nullable": True},
+                    "event_reference": {"type": "string", "description": "Referenced event", "nullable": True},
+                    "temporal_context": {"type": "string", "description": "When the RSVP was given (e.g., 'yesterday', 'just now')", "nullable": True}
+                },
+                "required": ["detected"]
+            },
+            "priority": {
+                "type": "object",
+                "description": "Priority detection",
+                "properties": {
+                    "detected": {"type": "boolean", "description": "Whether priority was detected"},
+                    "level": {"type": "string", "description": "Priority level (low/medium/high)", "nullable": True},
+                    "reason": {"type": "string", "description": "Priority reason", "nullable": True},
+                    "deadline_expression": {"type": "string", "description": "When the urgent task is due (e.g., 'by EOD', 'tomorrow')", "nullable": True}
+                },
+                "required": ["detected"]
+            },
+            "conflict": {
+                "type": "object",
+                "description": "Conflict detection with calendar analysis",
+                "properties": {
+                    "detected": {"type": "boolean", "description": "Whether conflicts were detected"},
+                    "conflicting_events": {"type": "array", "items": {"type": "string"}, "description": "List of conflicting event titles from message"},
+                    "calendar_conflicts": {"type": "array", "items": {"type": "object"}, "description": "Conflicts with user's existing calendar events"},
+                    "alternatives": {"type": "array", "items": {"type": "object"}, "description": "Suggested alternative times"},
+                    "reasoning": {"type": "string", "description": "Brief explanation of conflicts and suggestions"}
+                },
+                "required": ["detected", "conflicting_events", "calendar_conflicts", "alternatives", "reasoning"]
+            },
+            "sentiment": {
+                "type": "object",
+                "description": "Sentiment analysis",
+                "properties": {
+                    "sentiment": {"type": "string", "enum": ["positive", "negative", "neutral"], "description": "Overall sentiment"},
+                    "confidence": {"type": "number", "description": "Confidence from 0.0 to 1.0"},
+                    "emotions": {"type": "array", "items": {"type": "string"}, "description": "Emotions expressed"}
+                },
+                "required": ["sentiment", "confidence", "emotions"]
+            },
+            "key_points": {"type": "array", "items": {"type": "string"}, "description": "Key points of the message"}
+        },
+        "required": ["calendar", "reminder", "decision", "rsvp", "priority", "conflict", "sentiment", "key_points"]
+    }
+}
+_ANALYZE_TOOL_CHOICE = {"type": "function", "function": {"name": "analyze_message"}}
+
+# Changes whenever the static prompt or tool schema changes, invalidating cached extractions
+_ANALYSIS_PROMPT_VERSION = hashlib.blake2b(
+    _ANALYSIS_SYSTEM_PROMPT.encode("utf-8") + json_dumps(_ANALYZE_FUNCTION), digest_size=8
+).hexdigest()
+
+# Per-call user message; everything before it in the analysis prompt is static
+_ANALYSIS_USER_TEMPLATE = "CURRENT_DATE: {today}\nCURRENT_TIME: {now}\n\n{context}{calendar}MESSAGE:\n{text}"
+
+# System prompt for summarize_text
+_SUMMARY_PROMPT = "Summarize the following text in no more than {max_length} words. Be concise and capture the key points."
+
+# Top-level sections of the analyze_message schema (callers can skip any of them)
+_ANALYSIS_SECTIONS = frozenset((
+    "calendar", "reminder", "decision", "rsvp", "priority", "conflict", "sentiment", "key_points"
+))
+
+# Analysis returned when the model response is unusable (callers get deep copies)
+_EMPTY_RESULT = {
+    "calendar": {"detected": False, "title": None, "date_expression": None, "startTime": None, "endTime": None, "duration": None, "location": None, "is_invitation": False},
+    "reminder": {"detected": False, "title": None, "date_expression": None},
+    "decision": {"detected": False, "text": None},
+    "rsvp": {"detected": False, "status": None, "event_reference": None},
+    "priority": {"detected": False, "level": None, "reason": None},
+    "conflict": {
+        "detected": False,
+        "conflicting_events": [],
+        "calendar_conflicts": [],
+        "alternatives": [],
+        "reasoning": ""
+    },
+    "sentiment": {"sentiment": "neutral", "confidence": 0.5, "emotions": []},
+    "key_points": []
+}
+
+
+@lru_cache(maxsize=64)
+def _get_date_parser(
+    relative_base: datetime,
+    prefer_future: bool,
+    parsers: Optional[Tuple[str, ...]]
+) -> DateDataParser:
+    """
+    Reusable English-only DateDataParser for one settings combination.
+    dateparser.parse builds a new parser (and re-runs language detection) on every
+    call that passes settings; a pinned parser skips both.
+    """
+    settings = {
+        **_DATEPARSER_SETTINGS,
+        'RELATIVE_BASE': relative_base,
+        'PREFER_DATES_FROM': 'future' if prefer_future else 'current_period'
+    }
+    if parsers:
+        settings['PARSERS'] = list(parsers)
+    return DateDataParser(languages=['en'], settings=settings)
+
+
+@lru_cache(maxsize=4096)
+def _cached_parse(
+    expr: str,
+    relative_base: datetime,
+    prefer_future: bool = True,
+    parsers: Optional[Tuple[str, ...]] = None
+) -> Optional[datetime]:
+    """
+    Memoized date parsing for the small, highly repetitive vocabulary the model
+    returns ("tomorrow", "this Saturday", "7pm", ...). dateparser costs tens of ms
+    per call, so repeated expressions against the same reference minute become
+    dict lookups.
+    
+    Args:
+        expr: Normalized (lowercased, stripped) expression
+        relative_base: Reference datetime bucketed to the minute
+        prefer_future: Whether to prefer future dates for ambiguous expressions
+        parsers: Optional restricted list of dateparser PARSERS
+    
+    Returns:
+        Parsed datetime or None
+    """
+    return _get_date_parser(relative_base, prefer_future, parsers).get_date_data(expr).date_obj
+
+
+def _format_timestamp(dt: datetime) -> str:
+    """Format as 'YYYY-MM-DD HH:MM:SS' without going through strftime's locale machinery"""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
+
+def _format_date(dt: datetime) -> str:
+    """Format as 'YYYY-MM-DD'"""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+
+
+@lru_cache(maxsize=16)
+def _analysis_tools(skip: FrozenSet[str]) -> List[Dict[str, Any]]:
+    """Tools list for comprehensive analysis with the skipped sections removed from the schema"""
+    if not skip:
+        return [{"type": "function", "function": _ANALYZE_FUNCTION}]
+    parameters = _ANALYZE_FUNCTION["parameters"]
+    analyze_function = {
+        **_ANALYZE_FUNCTION,
+        "parameters": {
+            "type": "object",
+            "properties": {name: section for name, section in parameters["properties"].items() if name not in skip},
+            "required": [name for name in parameters["required"] if name not in skip]
+        }
+    }
+    return [{"type": "function", "function": analyze_function}]
+
+
+@lru_cache(maxsize=4)
+def _format_reference_time(reference_time: datetime) -> Tuple[str, str]:
+    """Format the prompt's date and time context; callers pass whole minutes so bursts share an entry"""
+    return reference_time.strftime('%Y-%m-%d (%A)'), reference_time.strftime('%H:%M')
+
+
+# Sentinel: fall back to the formatted reference time when an expression doesn't parse
+_REFERENCE = object()
+
+# Temporal fields resolved from an explicit model expression:
+# (section, is-active predicate, expression key, output key, formatter, value when unparseable)
+_TEMPORAL_FIELDS = (
+    ("reminder", lambda node: node["detected"] and node["date_expression"],
+     "date_expression", "due_date", _format_date, None),
+    ("decision", lambda node: node["detected"] and node["text"],
+     "temporal_context", "timestamp", _format_timestamp, _REFERENCE),
+    ("rsvp", lambda node: node["detected"],
+     "temporal_context", "timestamp", _format_timestamp, _REFERENCE),
+    ("priority", lambda node: node["detected"] and node["level"] in ("high", "medium"),
+     "deadline_expression", "deadline", _format_timestamp, None),
+)
+
+
+def _needs_resolution(result: Dict[str, Any]) -> bool:
+    """Whether an extraction has any dates to resolve or a calendar event to conflict-check"""
+    return bool(
+        result["calendar"]["detected"] or result["conflict"]["detected"]
+        or any(active(result[section]) for section, active, *_ in _TEMPORAL_FIELDS)
+    )
+
+
+def _parse_clock(value: str) -> Optional[Tuple[int, int]]:
+    """Split an 'HH:MM' string into (hour, minute); None when it isn't one"""
+    try:
+        hour, minute = map(int, value.split(':'))
+    except (ValueError, AttributeError):
+        return None
+    return hour, minute
+
+
+def _parse_relative(expr: str, relative_base: datetime) -> Optional[datetime]:
+    """
+    Resolve the common relative expressions the model returns without dateparser,
+    matching dateparser's results for them exactly
+    
+    Args:
+        expr: Normalized (lowercased, stripped) expression
+        relative_base: Naive reference datetime bucketed to the minute
+    
+    Returns:
+        Resolved datetime, or None when dateparser has to handle the expression
+    """
+    offset = _RELATIVE_DAY_OFFSETS.get(expr)
+    if offset is not None:
+        return relative_base + timedelta(days=offset)
+    weekday = _WEEKDAY_INDEX.get(expr)
+    if weekday is not None:
+        # Bare weekday: midnight of its next occurrence, 1-7 days ahead
+        days_ahead = (weekday - relative_base.weekday() - 1) % 7 + 1
+        return relative_base.replace(hour=0, minute=0) + timedelta(days=days_ahead)
+    if expr.startswith("in "):
+        match = _RELATIVE_SPAN_RE.fullmatch(expr, 3)
+    elif expr.endswith(" from now"):
+        match = _RELATIVE_SPAN_RE.fullmatch(expr, 0, len(expr) - 9)
+    else:
+        return None
+    if match is None:
+        return None
+    count = 1 if match.group(1) == "a" else int(match.group(1))
+    return relative_base + timedelta(days=count * (7 if match.group(2) == "week" else 1))
+
+
+def _parse_date(
+    expr: str,
+    reference_time: datetime,
+    parsers: Optional[Tuple[str, ...]] = None
+) -> Optional[datetime]:
+    """Parse a date expression, trying the hand-written fast path before memoized dateparser"""
+    expr = expr.lower().strip()
+    if len(expr) > _MAX_DATE_EXPRESSION_LENGTH or _NO_WORD_RE.fullmatch(expr):
+        return None
+    relative_base = reference_time.replace(second=0, microsecond=0)
+    if relative_base.tzinfo is None:
+        parsed = _parse_relative(expr, relative_base)
+        if parsed is not None:
+            return parsed
+    return _cached_parse(expr, relative_base, True, parsers)
+
+
+def _fit_token_budget(lines: List[str], budget: int, keep_latest: bool = False) -> List[str]:
+    """
+    Keep as many lines as fit in a token budget
+    
+    Args:
+        lines: Prompt lines in their original order
+        budget: Maximum total tokens
+        keep_latest: Keep lines from the end (most recent) instead of the start
+    
+    Returns:
+        Kept lines in their original order
+    """
+    kept = []
+    used = 0
+    for line in (reversed(lines) if keep_latest else lines):
+        used += estimate_tokens(line)
+        if used > budget:
+            break
+        kept.append(line)
+    if keep_latest:
+        kept.reverse()
+    return kept
+
+
+def _parse_first_match(
+    pattern: re.Pattern,
+    text: str,
+    group: int,
+    reference_time: datetime
+) -> Optional[datetime]:
+    """
+    Parse the first regex match in text that dateparser understands
+    
+    Args:
+        pattern: Compiled pattern to scan text with (one pass)
+        text: Text to scan
+        group: Match group holding the date expression
+        reference_time: Reference datetime for relative parsing
+    
+    Returns:
+        Parsed datetime of the first parseable match, or None
+    """
+    candidates = (_parse_date(match.group(group), reference_time) for match in pattern.finditer(text))
+    return next(filter(None, candidates), None)
+
+
+def _embedding_batches(texts: List[str], batch_size: int) -> List[Tuple[int, int]]:
+    """
+    Split texts into request-sized (start, end) slices
+    
+    Args:
+        texts: Texts to embed
+        batch_size: Maximum number of texts per request
+    
+    Returns:
+        Slices holding at most batch_size texts and _MAX_EMBEDDING_REQUEST_TOKENS tokens
+    """
+    batches = []
+    start = 0
+    tokens = 0
+    for end, text in enumerate(texts):
+        text_tokens = estimate_tokens(text)
+        if end > start and (end - start >= batch_size or tokens + text_tokens > _MAX_EMBEDDING_REQUEST_TOKENS):
+            batches.append((start, end))
+            start = end
+            tokens = 0
+        tokens += text_tokens
+    if start < len(texts):
+        batches.append((start, len(texts)))
+    return batches
+
+
+def _wait_for_retry_after(retry_state: RetryCallState) -> float:
+    """Tenacity wait: honor the server's Retry-After header, else jittered exponential backoff"""
+    response = getattr(retry_state.outcome.exception(), "response", None)
+    headers = response.headers if response is not None else {}
+    try:
+        if headers.get("retry-after-ms"):
+            return min(float(headers["retry-after-ms"]) / 1000, _MAX_RETRY_AFTER_SECONDS)
+        if headers.get("retry-after"):
+            return min(float(headers["retry-after"]), _MAX_RETRY_AFTER_SECONDS)
+    except ValueError:
+        pass  # HTTP-date form; fall back to backoff
+    return _BACKOFF(retry_state)
+
+
+# Retry policy for OpenAI calls; the SDK's own retries are disabled so attempts don't multiply
+_api_retry = retry(
+    retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+    wait=_wait_for_retry_after,
+    stop=stop_after_attempt(6),
+    before_sleep=before_sleep_log(logger, logging.DEBUG),
+    reraise=True
+)
+
+
+class _StreamAccumulator:
+    """
+    Assembles streamed chat completion deltas into a ChatCompletionMessage.
+    For structured responses it tracks JSON brace depth so the caller can stop
+    reading as soon as the top-level object closes.
+    """
+    
+    def __init__(self, structured: bool):
+        """
+        Args:
+            structured: Whether the response is a single JSON object (JSON mode or a forced tool call)
+        """
+        self.structured = structured
+        self.content_parts = []
+        self.tool_calls = {}  # Streamed tool calls by index
+        self._depth = 0
+        self._opened = False
+        self._in_string = False
+        self._escaped = False
+    
+    def add(self, chunk) -> bool:
+        """
+        Add a streamed chunk
+        
+        Returns:
+            True once a structured response's top-level JSON object has closed
+        """
+        if not chunk.choices:
+            return False
+        delta = chunk.choices[0].delta
+        closed = False
+        if delta.content:
+            self.content_parts.append(delta.content)
+            closed = self._scan(delta.content)
+        for tool_delta in delta.tool_calls or ():
+            tool_call = self.tool_calls.setdefault(
+                tool_delta.index,
+                {"id": None, "type": "function", "function": {"name": None, "arguments": ""}}
+            )
+            tool_call["id"] = tool_call["id"] or tool_delta.id
+            if tool_delta.function is None:
+                continue
+            function = tool_call["function"]
+            function["name"] = function["name"] or tool_delta.function.name
+            function["arguments"] += tool_delta.function.arguments or ""
+            closed = self._scan(tool_delta.function.arguments or "") or closed
+        return closed
+    
+    def _scan(self, fragment: str) -> bool:
+        """Advance the brace-depth scanner; True when the top-level object closes"""
+        if not self.structured:
+            return False
+        for char in fragment:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+                self._opened = True
+            elif char == "}":
+                self._depth -= 1
+                if self._opened and self._depth == 0:
+                    return True
+        return False
+    
+    def message(self) -> ChatCompletionMessage:
+        """Build the accumulated assistant message"""
+        return ChatCompletionMessage.model_validate({
+            "role": "assistant",
+            "content": "".join(self.content_parts) if self.content_parts else None,
+            "tool_calls": [self.tool_calls[index] for index in sorted(self.tool_calls)] or None
+        })
+
 
 class OpenAIService:
     """
@@ -16,15 +687,97 @@ class OpenAIService:
     Handles chat completions, embeddings, and AI-powered text generation.
     """
     
-    def __init__(self):
-        """Initialize OpenAI client"""
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    # Complete field structure of a comprehensive analysis, used to fill fields the
+    # model omitted. Shared across calls, so treat the nested values as read-only.
+    _ANALYSIS_DEFAULTS = {
+        "calendar": {
+            "detected": False, "title": None, "date_expression": None, 
+            "startTime": None, "endTime": None, "duration": None, "location": None, "is_invitation": False
+        },
+        "reminder": {
+            "detected": False, "title": None, "date_expression": None
+        },
+        "decision": {
+            "detected": False, "text": None, "temporal_context": None
+        },
+        "rsvp": {
+            "detected": False, "status": None, "event_reference": None, "temporal_context": None
+        },
+        "priority": {
+            "detected": False, "level": None, "reason": None, "deadline_expression": None
+        },
+        "conflict": {
+            "detected": False, "conflicting_events": []
+        },
+        "sentiment": {
+            "sentiment": "neutral", "confidence": 0.5, "emotions": []
+        }
+    }
+    
+    def __init__(
+        self,
+        max_concurrent_requests: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None
+    ):
+        """
+        Initialize OpenAI client
+        
+        Args:
+            max_concurrent_requests: Max in-flight async API calls (default from env)
+            requests_per_minute: Async request budget (default from env)
+            tokens_per_minute: Async token budget (default from env)
+        """
+        # One explicitly sized pool per client, shared by all calls (incl. threadpool fan-out)
+        self._sync_http = httpx.Client(http2=_HTTP2_AVAILABLE, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+        self.client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"), http_client=self._sync_http, max_retries=0  # Retried by _api_retry
+        )
+        self._http = httpx.AsyncClient(http2=_HTTP2_AVAILABLE, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+        self.aclient = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"), http_client=self._http, max_retries=0  # Retried by _api_retry
+        )
         self.embedding_model = "text-embedding-3-small"
+        # Optional shortened embeddings; must match the Pinecone index dimension
+        dimensions = os.getenv("EMBEDDING_DIMENSIONS")
+        self.embedding_dimensions = int(dimensions) if dimensions else None
         self.chat_model = "gpt-3.5-turbo"
+        self.analysis_model = os.getenv("ANALYZE_MODEL", "gpt-4o-mini")  # Comprehensive analysis
+        self.batch_model = os.getenv("OPENAI_BATCH_MODEL", "gpt-4o-mini")  # Offline Batch API jobs
+        # Opt-in: return the empty analysis without a model call for messages with no cues
+        self.keyword_gate = os.getenv("ANALYSIS_KEYWORD_GATE", "").lower() == "true"
+        
+        # Upper bound on concurrent in-flight analyses in analyze_messages_batch
+        self.max_concurrency = int(os.getenv("OPENAI_MAX_CONCURRENCY", "20"))
+        
+        # Preemptive RPM/TPM limiting for async calls so fan-outs queue instead of hitting 429s
+        self.rate_limiter = RateLimiter(max_concurrent_requests, requests_per_minute, tokens_per_minute)
+        
+        # LRU cache of text hash -> embedding tuple (identical inputs skip the API call)
+        self._embedding_cache: "OrderedDict[str, npt.NDArray[np.float32]]" = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
+        
+        # Optional persistent tier behind the LRU (survives restarts, shared by workers)
+        cache_path = os.getenv("EMBEDDING_CACHE_PATH")
+        self._embedding_disk_cache = EmbeddingDiskCache(cache_path) if cache_path else None
+        
+        # Exact-match cache of model extractions: in-process LRU, then Redis when configured
+        self.analysis_cache = AnalysisCache()
+        
+        # Opt-in nearest-neighbour cache for near-duplicate messages (SEMANTIC_CACHE_THRESHOLD),
+        # shared across workers through Redis; namespaced so model, prompt or embedding changes start fresh
+        self.semantic_cache = SemanticAnalysisCache(namespace=":".join((
+            self.analysis_model, _ANALYSIS_PROMPT_VERSION, self.embedding_model, str(self.embedding_dimensions or "")
+        )))
         
         # OpenAIService initialized successfully
     
-    def generate_embedding(self, text: str) -> List[float]:
+    async def aclose(self) -> None:
+        """Close the connection pools (call on application shutdown)"""
+        self._sync_http.close()
+        await self._http.aclose()
+    
+    def generate_embedding(self, text: str) -> npt.NDArray[np.float32]:
         """
         Generate embedding vector for text
         
@@ -32,13 +785,198 @@ class OpenAIService:
             text: Text to embed
         
         Returns:
-            List of floats representing the embedding vector
+            float32 embedding vector (call .tolist() where JSON is needed)
+        """
+        return self.generate_embeddings_batch([text])[0]
+    
+    def generate_embeddings_batch(self, texts: List[str], batch_size: int = 512) -> npt.NDArray[np.float32]:
+        """
+        Generate embedding vectors for many texts with one API call per batch
+        
+        The embeddings endpoint accepts up to 2048 inputs per request, so embedding
+        N texts costs ceil(N / batch_size) round trips instead of N. Batches are also
+        split before they would exceed the endpoint's per-request token limit.
+        
+        Args:
+            texts: Texts to embed
+            batch_size: Maximum number of texts sent per request
+        
+        Returns:
+            float32 array of shape (len(texts), dimensions), rows in the same order as texts
+        """
+        keys, found, missing = self._lookup_cached_embeddings(texts)
+        missing_keys = list(missing)
+        missing_texts = list(missing.values())
+        for start, end in _embedding_batches(missing_texts, batch_size):
+            response = self._create_embeddings(missing_texts[start:end])
+            self._store_embeddings(response, missing_keys[start:end], found)
+        
+        return self._stack_embeddings(keys, found)
+    
+    async def generate_embedding_async(self, text: str) -> npt.NDArray[np.float32]:
+        """
+        Async variant of generate_embedding
+        
+        Args:
+            text: Text to embed
+        
+        Returns:
+            float32 embedding vector (call .tolist() where JSON is needed)
+        """
+        return (await self.generate_embeddings_batch_async([text]))[0]
+    
+    async def generate_embeddings_batch_async(self, texts: List[str], batch_size: int = 512) -> npt.NDArray[np.float32]:
+        """
+        Async variant of generate_embeddings_batch; batches are requested concurrently
+        
+        Args:
+            texts: Texts to embed
+            batch_size: Maximum number of texts sent per request
+        
+        Returns:
+            float32 array of shape (len(texts), dimensions), rows in the same order as texts
         """
-        response = self.client.embeddings.create(
+        # The SQLite tier blocks, so it runs in a worker thread off the event loop
+        keys, found, missing = self._lookup_cached_embeddings(texts, disk=False)
+        if missing and self._embedding_disk_cache is not None:
+            await asyncio.to_thread(self._lookup_disk_embeddings, found, missing)
+        missing_keys = list(missing)
+        missing_texts = list(missing.values())
+        batches = _embedding_batches(missing_texts, batch_size)
+        
+        async def embed_batch(batch: List[str]):
+            async with self.rate_limiter.limit(sum(estimate_tokens(text) for text in batch)):
+                return await self._acreate_embeddings(batch)
+        
+        responses = await asyncio.gather(*(
+            embed_batch(missing_texts[start:end]) for start, end in batches
+        ))
+        for (start, end), response in zip(batches, responses):
+            self._store_embeddings(response, missing_keys[start:end], found, disk=False)
+        if missing_keys and self._embedding_disk_cache is not None:
+            await asyncio.to_thread(self._persist_embeddings, missing_keys, found)
+        
+        return self._stack_embeddings(keys, found)
+    
+    @_api_retry
+    def _create_embeddings(self, texts: List[str]):
+        """Call the embeddings endpoint for one batch, retrying transient failures"""
+        return self.client.embeddings.create(
             model=self.embedding_model,
-            input=text
+            input=texts,
+            dimensions=self.embedding_dimensions or NOT_GIVEN,
+            encoding_format="base64"  # Decoded straight into float32 arrays
         )
-        return response.data[0].embedding
+    
+    @_api_retry
+    async def _acreate_embeddings(self, texts: List[str]):
+        """Async variant of _create_embeddings; syncs the rate limiter with the response headers"""
+        raw = await self.aclient.embeddings.with_raw_response.create(
+            model=self.embedding_model,
+            input=texts,
+            dimensions=self.embedding_dimensions or NOT_GIVEN,
+            encoding_format="base64"
+        )
+        self.rate_limiter.observe_headers(raw.headers)
+        return raw.parse()
+    
+    def _lookup_cached_embeddings(
+        self,
+        texts: List[str],
+        disk: bool = True
+    ) -> Tuple[List[str], Dict[str, npt.NDArray[np.float32]], Dict[str, str]]:
+        """
+        Split texts into cache hits and misses
+        
+        Args:
+            texts: Texts to look up
+            disk: Also consult the persistent tier (async callers do that in a worker thread)
+        
+        Returns:
+            Tuple of (key per text, cached embeddings by key, uncached texts by key).
+            Misses are deduplicated and keep their input order.
+        """
+        keys = [self._embedding_key(text) for text in texts]
+        found: Dict[str, npt.NDArray[np.float32]] = {}
+        missing: Dict[str, str] = {}
+        with self._embedding_cache_lock:
+            for key, text in zip(keys, texts):
+                if key in found or key in missing:
+                    continue
+                cached = self._embedding_cache.get(key)
+                if cached is not None:
+                    self._embedding_cache.move_to_end(key)
+                    found[key] = cached
+                else:
+                    missing[key] = text
+        
+        if disk and missing and self._embedding_disk_cache is not None:
+            self._lookup_disk_embeddings(found, missing)
+        return keys, found, missing
+    
+    def _lookup_disk_embeddings(self, found: Dict[str, npt.NDArray[np.float32]], missing: Dict[str, str]) -> None:
+        """Second tier: one disk lookup for everything the LRU missed, moving hits from missing to found"""
+        for key, embedding in self._embedding_disk_cache.get_many(list(missing)).items():
+            del missing[key]
+            found[key] = embedding
+            self._cache_embedding(key, embedding)
+    
+    def _store_embeddings(
+        self,
+        response,
+        batch_keys: List[str],
+        found: Dict[str, npt.NDArray[np.float32]],
+        disk: bool = True
+    ) -> None:
+        """Record one embeddings response in found and the cache tiers (the persistent one only when disk is set)"""
+        # Response items carry their input position; don't rely on list order
+        for item in sorted(response.data, key=lambda item: item.index):
+            key = batch_keys[item.index]
+            if isinstance(item.embedding, str):
+                embedding = np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32)
+            else:
+                embedding = np.asarray(item.embedding, dtype=np.float32)
+            embedding.setflags(write=False)  # Cached arrays are shared; callers get copies
+            found[key] = embedding
+            self._cache_embedding(key, embedding)
+        if disk and self._embedding_disk_cache is not None:
+            self._persist_embeddings(batch_keys, found)
+    
+    def _persist_embeddings(self, keys: List[str], found: Dict[str, npt.NDArray[np.float32]]) -> None:
+        """Write the embeddings found for keys to the persistent tier"""
+        self._embedding_disk_cache.put_many((key, found[key]) for key in keys if key in found)
+    
+    def _embedding_key(self, text: str) -> str:
+        """Fixed-size content address of (model, dimensions, text); bounds memory held by keys"""
+        model = f"{self.embedding_model}:{self.embedding_dimensions}" if self.embedding_dimensions else self.embedding_model
+        return hashlib.blake2b(f"{model}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _stack_embeddings(keys: List[str], found: Dict[str, npt.NDArray[np.float32]]) -> npt.NDArray[np.float32]:
+        """Copy the embedding for each key into one (len(keys), dimensions) float32 array"""
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+    
+    def _cache_embedding(self, key: str, embedding: npt.NDArray[np.float32]) -> None:
+        """Insert an embedding into the LRU cache, evicting the oldest entry when full"""
+        with self._embedding_cache_lock:
+            self._embedding_cache[key] = embedding
+            self._embedding_cache.move_to_end(key)
+            if len(self._embedding_cache) > _EMBEDDING_CACHE_SIZE:
+                self._embedding_cache.popitem(last=False)
+    
+    def clear_embedding_cache(self, include_disk: bool = False) -> None:
+        """
+        Drop cached embeddings
+        
+        Args:
+            include_disk: Also clear the persistent cache (EMBEDDING_CACHE_PATH)
+        """
+        with self._embedding_cache_lock:
+            self._embedding_cache.clear()
+        if include_disk and self._embedding_disk_cache is not None:
+            self._embedding_disk_cache.clear()
     
     def chat_completion(
         self,
@@ -46,8 +984,11 @@ class OpenAIService:
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
-        functions: Optional[List[Dict]] = None,
-        function_call: Optional[Dict] = None
+        tools: Optional[List[Dict]] = None,
+        tool_choice: Optional[Dict] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        model: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate chat completion using GPT model
@@ -57,49 +998,203 @@ class OpenAIService:
             system_prompt: Optional system prompt to prepend
             temperature: Sampling temperature (0-2)
             max_tokens: Maximum tokens to generate
-            functions: Optional list of function definitions for function calling
-            function_call: Optional function call specification
+            tools: Optional list of tool (function) definitions
+            tool_choice: Optional tool choice specification (e.g. force a specific function)
+            response_format: Optional response format (e.g. {"type": "json_object"})
+            stream: Stream the response and stop reading once a structured result is complete
+            model: Model override (defaults to chat_model)
         
         Returns:
-            Generated response (text or function call result)
+            Generated response (text and/or tool calls)
+        """
+        if stream:
+            return self._chat_completion_stream(
+                messages, system_prompt, temperature, max_tokens, tools, tool_choice, response_format, model=model
+            )
+        request_params = self._build_chat_request(
+            messages, system_prompt, temperature, max_tokens, tools, tool_choice, response_format, model
+        )
+        response = self._create_chat_completion(request_params)
+        return self._chat_result(response.choices[0].message)
+    
+    async def chat_completion_async(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: Optional[Dict] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        model: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
+        Async variant of chat_completion that awaits the AsyncOpenAI client
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            system_prompt: Optional system prompt to prepend
+            temperature: Sampling temperature (0-2)
+            max_tokens: Maximum tokens to generate
+            tools: Optional list of tool (function) definitions
+            tool_choice: Optional tool choice specification (e.g. force a specific function)
+            response_format: Optional response format (e.g. {"type": "json_object"})
+            stream: Stream the response and stop reading once a structured result is complete
+            model: Model override (defaults to chat_model)
+        
+        Returns:
+            Generated response (text and/or tool calls)
+        """
+        request_params = self._build_chat_request(
+            messages, system_prompt, temperature, max_tokens, tools, tool_choice, response_format, model
+        )
+        tokens = sum(estimate_tokens(message.get("content") or "") for message in request_params["messages"])
+        tokens += max_tokens or _COMPLETION_TOKEN_RESERVE
+        async with self.rate_limiter.limit(tokens):
+            if not stream:
+                response = await self._acreate_chat_completion(request_params)
+                return self._chat_result(response.choices[0].message)
+            
+            request_params["stream"] = True
+            accumulator = _StreamAccumulator(self._is_structured(tool_choice, response_format))
+            response_stream = await self._acreate_chat_completion(request_params)
+            try:
+                async for chunk in response_stream:
+                    if accumulator.add(chunk):
+                        break  # Top-level JSON closed; skip any trailing tokens
+            finally:
+                await response_stream.close()
+        return self._chat_result(accumulator.message())
+    
+    def _build_chat_request(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        tools: Optional[List[Dict]],
+        tool_choice: Optional[Dict],
+        response_format: Optional[Dict[str, Any]],
+        model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build chat.completions.create parameters shared by the sync and async paths"""
+        model = model or self.chat_model
+        
         # Prepend system prompt if provided
         if system_prompt:
             messages = [{"role": "system", "content": system_prompt}] + messages
         
         # Prepare request parameters
         request_params = {
-            "model": self.chat_model,
+            "model": model,
             "messages": messages
         }
         
         # Add temperature only if the model supports it (not gpt-5-nano)
-        if self.chat_model != "gpt-5-nano":
+        if model != "gpt-5-nano":
             request_params["temperature"] = temperature
         
         # Add optional parameters
         if max_tokens:
             request_params["max_tokens"] = max_tokens
-        if functions:
-            request_params["functions"] = functions
-        if function_call:
-            request_params["function_call"] = function_call
-        
-        response = self.client.chat.completions.create(**request_params)
-        
-        message = response.choices[0].message
+        if tools:
+            request_params["tools"] = tools
+        if tool_choice:
+            request_params["tool_choice"] = tool_choice
+        if response_format:
+            request_params["response_format"] = response_format
         
+        return request_params
+    
+    @_api_retry
+    def _create_chat_completion(self, request_params: Dict[str, Any]):
+        """Call the chat completions endpoint, retrying transient failures"""
+        return self.client.chat.completions.create(**request_params)
+    
+    @_api_retry
+    async def _acreate_chat_completion(self, request_params: Dict[str, Any]):
+        """Async variant of _create_chat_completion; syncs the rate limiter with the response headers"""
+        raw = await self.aclient.chat.completions.with_raw_response.create(**request_params)
+        self.rate_limiter.observe_headers(raw.headers)
+        return raw.parse()
+    
+    @staticmethod
+    def _is_structured(tool_choice: Optional[Dict], response_format: Optional[Dict[str, Any]]) -> bool:
+        """Whether a response is a single JSON object (forced tool call or JSON mode)"""
+        return isinstance(tool_choice, dict) or bool(response_format and response_format.get("type") != "text")
+    
+    @staticmethod
+    def _chat_result(message: ChatCompletionMessage) -> Dict[str, Any]:
+        """Extract content and tool calls from a chat completion message"""
         # Return structured response
-        result = {
+        return {
             "content": message.content,
-            "function_call": message.function_call
+            "tool_calls": message.tool_calls or []
         }
+    
+    def _chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: Optional[Dict] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Streaming variant of chat_completion returning the same result shape
+        
+        Accumulates content / tool call argument deltas as they arrive and stops
+        reading once a structured result's JSON object closes.
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            system_prompt: Optional system prompt to prepend
+            temperature: Sampling temperature (0-2)
+            max_tokens: Maximum tokens to generate
+            tools: Optional list of tool (function) definitions
+            tool_choice: Optional tool choice specification (e.g. force a specific function)
+            response_format: Optional response format (e.g. {"type": "json_object"})
+            model: Model override (defaults to chat_model)
+        
+        Returns:
+            Generated response (text and/or tool calls)
+        """
+        request_params = self._build_chat_request(
+            messages, system_prompt, temperature, max_tokens, tools, tool_choice, response_format, model
+        )
+        request_params["stream"] = True
+        
+        accumulator = _StreamAccumulator(self._is_structured(tool_choice, response_format))
+        response_stream = self._create_chat_completion(request_params)
+        try:
+            for chunk in response_stream:
+                if accumulator.add(chunk):
+                    break  # Top-level JSON closed; skip any trailing tokens
+        finally:
+            response_stream.close()
+        
+        return self._chat_result(accumulator.message())
+    
+    def analyze_sentiment(self, text: str) -> Dict[str, Any]:
+        """
+        Analyze sentiment of text
+        
+        Args:
+            text: Text to analyze
         
-        return result
+        Returns:
+            Dictionary with sentiment analysis results
+        """
+        # Served by the comprehensive analysis call with every other section skipped
+        return self.analyze_message_comprehensive(text, skip=_ANALYSIS_SECTIONS - {"sentiment"})["sentiment"]
     
-    def analyze_sentiment(self, text: str) -> Dict[str, Any]:
+    async def analyze_sentiment_async(self, text: str) -> Dict[str, Any]:
         """
-        Analyze sentiment of text
+        Async variant of analyze_sentiment
         
         Args:
             text: Text to analyze
@@ -107,37 +1202,32 @@ class OpenAIService:
         Returns:
             Dictionary with sentiment analysis results
         """
-        system_prompt = """You are a sentiment analysis expert. Analyze the sentiment of the given text.
-Respond with ONLY a JSON object in this exact format:
-{
-    "sentiment": "positive|negative|neutral",
-    "confidence": 0.0-1.0,
-    "emotions": ["emotion1", "emotion2"]
-}"""
+        analysis = await self.analyze_message_comprehensive_async(text, skip=_ANALYSIS_SECTIONS - {"sentiment"})
+        return analysis["sentiment"]
+    
+    def summarize_text(self, text: str, max_length: int = 100) -> str:
+        """
+        Generate a summary of the text
+        
+        Args:
+            text: Text to summarize
+            max_length: Maximum length of summary in words
         
+        Returns:
+            Summary text
+        """
         messages = [{"role": "user", "content": text}]
         
         response = self.chat_completion(
             messages=messages,
-            system_prompt=system_prompt,
-            temperature=0.3
+            system_prompt=_SUMMARY_PROMPT.format(max_length=max_length),
+            temperature=0.5
         )
-        
-        # Parse JSON response
-        import json
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError:
-            return {
-                "sentiment": "neutral",
-                "confidence": 0.5,
-                "emotions": [],
-                "error": "Failed to parse response"
-            }
+        return response["content"]
     
-    def summarize_text(self, text: str, max_length: int = 100) -> str:
+    async def summarize_text_async(self, text: str, max_length: int = 100) -> str:
         """
-        Generate a summary of the text
+        Async variant of summarize_text
         
         Args:
             text: Text to summarize
@@ -146,15 +1236,43 @@ Respond with ONLY a JSON object in this exact format:
         Returns:
             Summary text
         """
-        system_prompt = f"Summarize the following text in no more than {max_length} words. Be concise and capture the key points."
-        
         messages = [{"role": "user", "content": text}]
         
-        return self.chat_completion(
+        response = await self.chat_completion_async(
             messages=messages,
-            system_prompt=system_prompt,
+            system_prompt=_SUMMARY_PROMPT.format(max_length=max_length),
             temperature=0.5
         )
+        return response["content"]
+    
+    async def summarize_text_stream(self, text: str, max_length: int = 100) -> AsyncIterator[str]:
+        """
+        Streaming variant of summarize_text for interactive callers
+        
+        Args:
+            text: Text to summarize
+            max_length: Maximum length of summary in words
+        
+        Yields:
+            Summary text fragments as the model generates them
+        """
+        request_params = self._build_chat_request(
+            [{"role": "user", "content": text}],
+            _SUMMARY_PROMPT.format(max_length=max_length),
+            0.5, None, None, None, None
+        )
+        request_params["stream"] = True
+        tokens = sum(estimate_tokens(message["content"]) for message in request_params["messages"])
+        # The slot is held only while the stream opens; reading it runs at the client's
+        # pace and must not starve other calls sharing the limiter
+        async with self.rate_limiter.limit(tokens + _COMPLETION_TOKEN_RESERVE):
+            response_stream = await self._acreate_chat_completion(request_params)
+        try:
+            async for chunk in response_stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await response_stream.close()
     
     def extract_key_points(self, text: str) -> List[str]:
         """
@@ -166,23 +1284,20 @@ Respond with ONLY a JSON object in this exact format:
         Returns:
             List of key points
         """
-        system_prompt = """Extract the key points from the text as a JSON array of strings.
-Respond with ONLY a JSON array like: ["point1", "point2", "point3"]"""
-        
-        messages = [{"role": "user", "content": text}]
+        return self.analyze_message_comprehensive(text, skip=_ANALYSIS_SECTIONS - {"key_points"})["key_points"]
+    
+    async def extract_key_points_async(self, text: str) -> List[str]:
+        """
+        Async variant of extract_key_points
         
-        response = self.chat_completion(
-            messages=messages,
-            system_prompt=system_prompt,
-            temperature=0.3
-        )
+        Args:
+            text: Text to analyze
         
-        # Parse JSON response
-        import json
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError:
-            return []
+        Returns:
+            List of key points
+        """
+        analysis = await self.analyze_message_comprehensive_async(text, skip=_ANALYSIS_SECTIONS - {"key_points"})
+        return analysis["key_points"]
     
     def analyze_message_comprehensive(
         self, 
@@ -190,10 +1305,67 @@ Respond with ONLY a JSON array like: ["point1", "point2", "point3"]"""
         message_timestamp: Optional[str] = None,
         user_calendar: Optional[List[Dict[str, Any]]] = None,
         conversation_context: Optional[List[Dict[str, Any]]] = None,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        stream: bool = False,
+        skip: Optional[Set[str]] = None,
+        skip_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Comprehensive message analysis detecting events, reminders, decisions, RSVP, priority,
+        conflicts, sentiment and key points in a single completion
+        
+        Args:
+            text: Message text to analyze
+            message_timestamp: Optional ISO 8601 timestamp of when the message was sent (for accurate date calculations)
+            user_calendar: Optional list of user's existing calendar events for conflict detection
+            conversation_context: Optional list of recent messages from conversation for RAG (Story 5.2)
+            user_id: Optional user ID for conflict detection (Story 5.6)
+            stream: Stream the completion and stop reading once the tool call's JSON closes
+            skip: Schema sections to leave out of the model output (they get default values)
+            skip_cache: Bypass the analysis caches (privacy-sensitive flows)
+        
+        Returns:
+            Dictionary with all detection results
+        """
+        if not skip and self._gated_out(text, conversation_context):
+            return self._get_default_analysis()
+        request, reference_time, message_timezone, cache_key = self._prepare_comprehensive_request(
+            text, user_calendar, conversation_context, skip
+        )
+        extraction = None if skip_cache else self.analysis_cache.get(cache_key)
+        embedding = None
+        if extraction is None and self._use_semantic_cache(skip, skip_cache, user_calendar, conversation_context):
+            embedding = self.generate_embedding(text)
+            extraction = self.semantic_cache.lookup(user_id or "", embedding)
+        if extraction is None:
+            response = self.chat_completion(**request, stream=stream)
+            extraction = self._extract_analysis(response)
+            if extraction is None:
+                return self._get_default_analysis()
+            if not skip_cache:
+                self.analysis_cache.set(cache_key, extraction)
+            if embedding is not None:
+                self.semantic_cache.store(user_id or "", embedding, extraction)
+        return self._finalize_analysis(
+            extraction, reference_time, message_timezone, user_calendar, user_id
+        )
+    
+    async def analyze_message_comprehensive_async(
+        self, 
+        text: str,
+        message_timestamp: Optional[str] = None,
+        user_calendar: Optional[List[Dict[str, Any]]] = None,
+        conversation_context: Optional[List[Dict[str, Any]]] = None,
+        user_id: Optional[str] = None,
+        stream: bool = False,
+        skip: Optional[Set[str]] = None,
+        skip_cache: bool = False
     ) -> Dict[str, Any]:
         """
-        Comprehensive message analysis detecting events, reminders, decisions, RSVP, priority, and conflicts
+        Async variant of analyze_message_comprehensive
+        
+        Awaits the model call on the event loop and runs the CPU-bound date parsing and
+        blocking Pinecone conflict check in a worker thread.
         
         Args:
             text: Message text to analyze
@@ -201,324 +1373,359 @@ Respond with ONLY a JSON array like: ["point1", "point2", "point3"]"""
             user_calendar: Optional list of user's existing calendar events for conflict detection
             conversation_context: Optional list of recent messages from conversation for RAG (Story 5.2)
             user_id: Optional user ID for conflict detection (Story 5.6)
+            stream: Stream the completion and stop reading once the tool call's JSON closes
+            skip: Schema sections to leave out of the model output (they get default values)
+            skip_cache: Bypass the analysis caches (privacy-sensitive flows)
         
         Returns:
             Dictionary with all detection results
         """
-        import json
-        from datetime import datetime, timedelta
+        if not skip and self._gated_out(text, conversation_context):
+            return self._get_default_analysis()
+        request, reference_time, message_timezone, cache_key = self._prepare_comprehensive_request(
+            text, user_calendar, conversation_context, skip
+        )
+        extraction = None if skip_cache else await self.analysis_cache.get_async(cache_key)
+        embedding = None
+        if extraction is None and self._use_semantic_cache(skip, skip_cache, user_calendar, conversation_context):
+            embedding = await self.generate_embedding_async(text)
+            extraction = await self.semantic_cache.lookup_async(user_id or "", embedding)
+        if extraction is None:
+            response = await self.chat_completion_async(**request, stream=stream)
+            extraction = self._extract_analysis(response)
+            if extraction is None:
+                return self._get_default_analysis()
+            if not skip_cache:
+                await self.analysis_cache.set_async(cache_key, extraction)
+            if embedding is not None:
+                await self.semantic_cache.store_async(user_id or "", embedding, extraction)
+        if not _needs_resolution(extraction):
+            # Nothing to parse and no Pinecone query: finish inline without a thread hop
+            return self._finalize_analysis(
+                extraction, reference_time, message_timezone, user_calendar, user_id
+            )
+        return await asyncio.to_thread(
+            self._finalize_analysis,
+            extraction, reference_time, message_timezone, user_calendar, user_id
+        )
+    
+    async def analyze_messages_batch(
+        self,
+        texts: List[str],
+        return_exceptions: bool = False,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Analyze many messages concurrently (backfills, conversation imports)
+        
+        At most max_concurrency analyses are in flight at once. Transient API failures
+        are retried per call by _api_retry, so nothing is retried again here.
+        
+        Args:
+            texts: Message texts to analyze
+            return_exceptions: Return a failed message's exception in its slot instead of
+                raising, so one failure doesn't discard the rest of the batch
+            **kwargs: Extra arguments forwarded to analyze_message_comprehensive_async
+        
+        Returns:
+            Analysis results (or exceptions) in the same order as texts
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def analyze_one(text: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze_message_comprehensive_async(text, **kwargs)
+        
+        return await asyncio.gather(
+            *(analyze_one(text) for text in texts),
+            return_exceptions=return_exceptions
+        )
+    
+    def submit_comprehensive_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> str:
+        """
+        Submit offline comprehensive analyses to the OpenAI Batch API
+        
+        Batch jobs cost half as much and don't count against the interactive rate
+        limits, but finish within a 24h window. Use for backfills and re-analysis.
+        
+        Args:
+            items: (custom_id, options) pairs; options holds "text" and optionally
+                "user_calendar" and "conversation_context"
+        
+        Returns:
+            Batch ID for poll_batch / fetch_batch_results
+        """
+        lines = []
+        reference_time = None
+        for custom_id, options in items:
+            request, reference_time, _, _ = self._prepare_comprehensive_request(
+                options["text"], options.get("user_calendar"), options.get("conversation_context")
+            )
+            body = self._build_chat_request(max_tokens=None, response_format=None, **request)
+            body["model"] = self.batch_model
+            lines.append(json_dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }))
+        if not lines:
+            raise ValueError("Cannot submit an empty batch")
+        
+        batch_file = self.client.files.create(file=("analysis_batch.jsonl", b"\n".join(lines)), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            # Relative dates in the results resolve against submission time, not fetch time
+            metadata={"reference_time": reference_time.isoformat()}
+        )
+        logger.info("Submitted analysis batch %s with %d messages", batch.id, len(lines))
+        return batch.id
+    
+    def poll_batch(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Check the progress of a submitted batch
+        
+        Args:
+            batch_id: Batch ID from submit_comprehensive_batch
+        
+        Returns:
+            Dictionary with status and request counts
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        return {
+            "id": batch.id,
+            "status": batch.status,
+            "completed": counts.completed if counts else 0,
+            "failed": counts.failed if counts else 0,
+            "total": counts.total if counts else 0
+        }
+    
+    def fetch_batch_results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Download a completed batch and parse each response into an analysis result
+        
+        Date expressions are resolved against the submission time. The Pinecone
+        conflict check is skipped because calendars may have changed since then.
+        
+        Args:
+            batch_id: Batch ID from submit_comprehensive_batch
+        
+        Returns:
+            Analysis results by custom_id (failed requests get the default analysis)
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status != "completed" or not batch.output_file_id:
+            raise ValueError(f"Batch {batch_id} is not complete (status: {batch.status})")
+        
+        reference_time = datetime.fromisoformat((batch.metadata or {})["reference_time"])
+        results = {}
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line:
+                continue
+            entry = json_loads(line)
+            extraction = None
+            response = entry.get("response") or {}
+            if response.get("status_code") == 200:
+                message = ChatCompletion.model_validate(response["body"]).choices[0].message
+                extraction = self._extract_analysis(self._chat_result(message))
+            else:
+                logger.warning("Batch request %s failed: %s", entry.get("custom_id"), entry.get("error"))
+            if extraction is None:
+                results[entry["custom_id"]] = self._get_default_analysis()
+            else:
+                results[entry["custom_id"]] = self._parse_date_expressions(extraction, reference_time, None)
+        return results
+    
+    def _gated_out(self, text: str, conversation_context: Optional[List[Dict[str, Any]]]) -> bool:
+        """
+        Whether the keyword gate lets this message skip the model (chatter like "lol", "ok").
+        Messages with conversation context always go through: a bare "yes" can be an RSVP.
+        Only full analyses are gated; sentiment and key point requests (skip set) never are.
+        """
+        return self.keyword_gate and not conversation_context and not _TRIGGER_RE.search(text)
+    
+    def _use_semantic_cache(
+        self,
+        skip: Optional[Set[str]],
+        skip_cache: bool,
+        user_calendar: Optional[List[Dict[str, Any]]],
+        conversation_context: Optional[List[Dict[str, Any]]]
+    ) -> bool:
+        """
+        Whether a near-duplicate's extraction can stand in for this analysis.
+        Only full, context-free analyses qualify: RAG context and calendars change the
+        extraction without changing the message embedding.
+        """
+        return (
+            self.semantic_cache.enabled
+            and not skip_cache
+            and not skip
+            and not user_calendar
+            and not conversation_context
+        )
+    
+    def _prepare_comprehensive_request(
+        self,
+        text: str,
+        user_calendar: Optional[List[Dict[str, Any]]],
+        conversation_context: Optional[List[Dict[str, Any]]],
+        skip: Optional[Set[str]] = None
+    ) -> Tuple[Dict[str, Any], datetime, Optional[Any], str]:
+        """
+        Build the chat completion request for comprehensive analysis
+        
+        Sections in skip are dropped from the tool schema, shortening the model output.
         
+        Returns:
+            Tuple of (chat_completion kwargs, reference time, message timezone, cache key).
+            The cache key covers everything the model sees except the current date/time,
+            which the extraction doesn't depend on (relative expressions are resolved later).
+        """
         # QUICK FIX: Always use current server time for relative date parsing
         # This ensures "tomorrow" is calculated from the user's perspective
         # TODO: Replace with location-based timezone detection
         reference_time = datetime.now()
         message_timezone = None
-        print(f"🌍 Using server time as reference: {reference_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.debug("🌍 Using server time as reference: %s", reference_time)
         
         # Build conversation context if provided (Story 5.2 - Lightweight RAG)
         context_section = ""
         if conversation_context and len(conversation_context) > 0:
-            context_section = "\n\nRECENT CONVERSATION CONTEXT:\n"
-            for msg in conversation_context:
-                sender = msg.get('metadata', {}).get('sender', 'User')
-                content = msg.get('content', '')
-                context_section += f"{sender}: {content}\n"
-            context_section += f"\nCurrent message: {text}\n"
+            lines = [
+                f"{msg.get('metadata', {}).get('sender', 'User')}: {msg.get('content', '')}\n"
+                for msg in conversation_context
+            ]
+            # Budget by tokens, keeping the most recent messages
+            kept = _fit_token_budget(lines, _MAX_CONTEXT_TOKENS, keep_latest=True)
+            if len(kept) < len(lines):
+                logger.info("Dropped %d of %d context messages over the token budget", len(lines) - len(kept), len(lines))
+            context_section = "".join(["RECENT_CONTEXT:\n", *kept, "\n"])
         
         # Build calendar context if provided
         calendar_context = ""
         if user_calendar:
-            calendar_context = "\n\nUser's existing calendar events:\n"
-            for event in user_calendar[:10]:  # Limit to 10 most recent
-                calendar_context += f"- {event.get('title', 'Untitled')} on {event.get('date', 'Unknown')} from {event.get('startTime', 'Unknown')} to {event.get('endTime', 'Unknown')}\n"
+            lines = [
+                f"- {event.get('title', 'Untitled')} on {event.get('date', 'Unknown')} from {event.get('startTime', 'Unknown')} to {event.get('endTime', 'Unknown')}\n"
+                for event in user_calendar
+            ]
+            kept = _fit_token_budget(lines, _MAX_CALENDAR_TOKENS)
+            if len(kept) < len(lines):
+                logger.info("Dropped %d of %d calendar events over the token budget", len(lines) - len(kept), len(lines))
+            calendar_context = "".join(["CALENDAR:\n", *kept, "\n"])
         
-        system_prompt = f"""You are an AI assistant that analyzes messages for important information.
-
-IMPORTANT DISTINCTIONS:
-- **Events** are scheduled activities involving other people or social gatherings. Examples: "Dinner Friday at 7pm", "Meeting tomorrow at 2pm", "Party at my place Saturday", "Arcade tonight at 7pm", "Coffee today at 3pm"
-- **Reminders** are personal tasks or commitments (even with specific times). Examples: "I'll finish the presentation by noon tomorrow", "Send docs by Friday", "Call mom at 3pm", "Submit report by EOD"
-
-CALENDAR EVENT DETECTION RULES:
-1. If message contains a TIME + LOCATION/ACTIVITY → ALWAYS detect as calendar event
-2. If message contains "tonight", "today", "tomorrow" + activity → ALWAYS detect as calendar event  
-3. If message contains "Let's", "We should", "Want to" + time → ALWAYS detect as calendar event
-4. Examples that MUST be detected as calendar events:
-   - "Let's go to the arcade tonight at 7pm" → CALENDAR EVENT
-   - "Arcade today at 7pm" → CALENDAR EVENT  
-   - "Coffee tomorrow morning" → CALENDAR EVENT
-   - "Dinner Friday at 7pm" → CALENDAR EVENT
-- **Decisions** are group agreements with NO time constraints. Example: "Let's go to Italian restaurant"
-
-INVITATION LANGUAGE DETECTION:
-An event contains "invitation language" if it:
-- Uses inclusive language ("Let's", "We should", "Want to", "How about")
-- Suggests participation ("Come to", "Join us", "Meet me", "Go to")
-- Uses question format ("Want to grab coffee?", "Should we meet?")
-- Contains social gathering language ("Party", "Dinner", "Meet up", "Hang out")
-
-Examples of INVITATION language:
-- "Let's go to the store tomorrow at 2pm" → is_invitation=true
-- "Want to grab coffee tomorrow?" → is_invitation=true
-- "Come to my party Friday night" → is_invitation=true
-- "Should we meet for lunch?" → is_invitation=true
-
-Examples of NON-invitation language:
-- "I have a meeting tomorrow at 2pm" → is_invitation=false
-- "The conference is next Tuesday" → is_invitation=false
-- "Doctor appointment at 3pm" → is_invitation=false
-
-{context_section if context_section else f'Analyze this message: "{text}"'}{calendar_context}
-
-CRITICAL DATE/TIME PARSING RULES:
-Current date context: {reference_time.strftime('%Y-%m-%d (%A)')}
-Current time context: {reference_time.strftime('%H:%M')}
-
-Your job is to EXTRACT temporal expressions, NOT calculate dates.
-Examples:
-- "Let's meet tomorrow at 7pm" → extract: date_expression="tomorrow", startTime="19:00", endTime=null
-- "Dinner this Saturday" → extract: date_expression="this Saturday", startTime=null, endTime=null
-- "Arcade tonight at 7pm" → extract: date_expression="today", startTime="19:00", endTime=null
-- "Coffee in 3 days at 2pm" → extract: date_expression="3 days from now", startTime="14:00", endTime=null
-- "Meeting next Monday morning" → extract: date_expression="next Monday", startTime="09:00", endTime=null
-- "Meeting next Tuesday at 3pm" → extract: date_expression="next Tuesday", startTime="15:00", endTime=null
-- "Conference call next week" → extract: date_expression="next week", startTime=null, endTime=null
-- "Meeting 2pm to 4pm" → extract: startTime="14:00", endTime="16:00"
-- "Lunch from 12:30 to 1:30" → extract: startTime="12:30", endTime="13:30"
-
-RELATIVE DATE PARSING (be precise with these):
-- "next Tuesday" → date_expression="next Tuesday" (NOT "this Tuesday")
-- "this Tuesday" → date_expression="this Tuesday" (current week's Tuesday)
-- "tonight" → date_expression="today" (same day, evening time)
-- "this evening" → date_expression="today" (same day, evening time)
-- "next week" → date_expression="next week"
-- "this weekend" → date_expression="this weekend"
-- "next weekend" → date_expression="next weekend"
-- "in 2 weeks" → date_expression="in 2 weeks"
-- "next month" → date_expression="next month"
-
-CRITICAL TIME PARSING (these often fail - be precise):
-- "at noon" → startTime="12:00"
-- "7pm" → startTime="19:00"
-- "4:44pm" → startTime="16:44"
-- "midnight" → startTime="00:00"
-- "in the morning" → startTime="09:00" (default morning time)
-- "in the afternoon" → startTime="15:00" (default afternoon time)
-- "in the evening" → startTime="19:00" (default evening time)
-
-IMPORTANT: If endTime is NOT mentioned, leave it null. Backend will apply 1-hour default automatically.
-
-COMMON TIME ACRONYMS (already expanded in input):
-- EOD/end of day → 11:59 PM
-- EOB/end of business → 5:00 PM
-- ASAP/as soon as possible → 1 hour from now
-- EOW/end of week → Friday 5:00 PM
-
-TEMPORAL CONTEXT EXTRACTION:
-- **Decisions**: Look for when decisions were made ("yesterday we decided", "earlier today")
-- **RSVP**: Look for response timing ("I can't make tomorrow's meeting", "I'm in for Friday")
-- **Priority**: Look for urgency deadlines ("need by EOD", "urgent, due tomorrow")
-- **Conflicts**: Look for when conflicts occur ("conflicts with my 3pm meeting")
-- **Calendar Conflicts**: If user_calendar is provided, check for time overlaps with existing events
-- **Same Event Detection**: If event titles are similar (>70%) and times overlap, it's likely the same event
-- **Alternative Suggestions**: If conflicts exist, suggest nearby available times
-
-DO NOT calculate actual dates - just extract the expression and time!
+        # All per-call details go in the user message after the static system prompt
+        today, now = _format_reference_time(reference_time.replace(second=0, microsecond=0))
+        user_prompt = _ANALYSIS_USER_TEMPLATE.format(
+            today=today, now=now, context=context_section, calendar=calendar_context, text=text
+        )
 
-Analyze the message and use the analyze_message function to return structured results."""
-
-        # Define the function schema for structured output
-        functions = [
-            {
-                "name": "analyze_message",
-                "description": "Analyze a message for events, reminders, decisions, RSVP, priority, and conflicts",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "calendar": {
-                            "type": "object",
-                            "description": "Calendar event detection",
-                            "properties": {
-                                "detected": {"type": "boolean", "description": "Whether a calendar event was detected"},
-                                "title": {"type": "string", "description": "Event title", "nullable": True},
-                                "date_expression": {"type": "string", "description": "Temporal expression as-is from message", "nullable": True},
-                                "startTime": {"type": "string", "description": "Start time in HH:MM format (24-hour). Examples: 'noon'->12:00, '7pm'->19:00, '4:44pm'->16:44", "nullable": True},
-                                "endTime": {"type": "string", "description": "End time in HH:MM format (24-hour). If not specified, leave null to apply 1-hour default", "nullable": True},
-                                "location": {"type": "string", "description": "Event location", "nullable": True},
-                                "is_invitation": {"type": "boolean", "description": "Whether contains invitation language"}
-                            },
-                            "required": ["detected", "is_invitation"]
-                        },
-                        "reminder": {
-                            "type": "object",
-                            "description": "Reminder detection",
-                            "properties": {
-                                "detected": {"type": "boolean", "description": "Whether a reminder was detected"},
-                                "title": {"type": "string", "description": "Reminder title", "nullable": True},
-                                "date_expression": {"type": "string", "description": "Due date expression", "nullable": True}
-                            },
-                            "required": ["detected"]
-                        },
-                        "decision": {
-                            "type": "object",
-                            "description": "Decision detection",
-                            "properties": {
-                                "detected": {"type": "boolean", "description": "Whether a decision was detected"},
-                                "text": {"type": "string", "description": "Complete decision statement", "nullable": True},
-                                "temporal_context": {"type": "string", "description": "When the decision was made (e.g., 'yesterday', 'earlier today')", "nullable": True}
-                            },
-                            "required": ["detected"]
-                        },
-                        "rsvp": {
-                            "type": "object",
-                            "description": "RSVP detection",
-                            "properties": {
-                                "detected": {"type": "boolean", "description": "Whether an RSVP was detected"},
-                                "status": {"type": "string", "description": "RSVP status (accepted/declined)", "nullable": True},
-                                "event_reference": {"type": "string", "description": "Referenced event", "nullable": True},
-                                "temporal_context": {"type": "string", "description": "When the RSVP was given (e.g., 'yesterday', 'just now')", "nullable": True}
-                            },
-                            "required": ["detected"]
-                        },
-                        "priority": {
-                            "type": "object",
-                            "description": "Priority detection",
-                            "properties": {
-                                "detected": {"type": "boolean", "description": "Whether priority was detected"},
-                                "level": {"type": "string", "description": "Priority level (low/medium/high)", "nullable": True},
-                                "reason": {"type": "string", "description": "Priority reason", "nullable": True},
-                                "deadline_expression": {"type": "string", "description": "When the urgent task is due (e.g., 'by EOD', 'tomorrow')", "nullable": True}
-                            },
-                            "required": ["detected"]
-                        },
-                        "conflict": {
-                            "type": "object",
-                            "description": "Conflict detection with calendar analysis",
-                            "properties": {
-                                "detected": {"type": "boolean", "description": "Whether conflicts were detected"},
-                                "conflicting_events": {"type": "array", "items": {"type": "string"}, "description": "List of conflicting event titles from message"},
-                                "calendar_conflicts": {"type": "array", "items": {"type": "object"}, "description": "Conflicts with user's existing calendar events"},
-                                "alternatives": {"type": "array", "items": {"type": "object"}, "description": "Suggested alternative times"},
-                                "reasoning": {"type": "string", "description": "Brief explanation of conflicts and suggestions"}
-                            },
-                            "required": ["detected", "conflicting_events", "calendar_conflicts", "alternatives", "reasoning"]
-                        }
-                    },
-                    "required": ["calendar", "reminder", "decision", "rsvp", "priority", "conflict"]
-                }
-            }
-        ]
+        # Static rules first so OpenAI's prompt cache can reuse the prefix across calls
+        messages = [{"role": "user", "content": user_prompt}]
         
-        messages = [{"role": "user", "content": text}]
-        
-        response = self.chat_completion(
-            messages=messages,
-            system_prompt=system_prompt,
-            temperature=0.2,  # Low temperature for consistent structured output
-            functions=functions,
-            function_call={"name": "analyze_message"}  # Force function call
-        )
+        request = {
+            "messages": messages,
+            "model": self.analysis_model,
+            "system_prompt": _ANALYSIS_SYSTEM_PROMPT,
+            "temperature": 0.2,  # Low temperature for consistent structured output
+            "tools": _analysis_tools(frozenset(skip or ())),  # Prebuilt schema, minus skipped sections
+            "tool_choice": _ANALYZE_TOOL_CHOICE  # Force the tool call
+        }
+        # Messages without context/calendar key on the text alone, maximizing hits
+        cache_key = "analysis:" + hashlib.sha1(
+            "|".join((
+                self.analysis_model, _ANALYSIS_PROMPT_VERSION, text, context_section, calendar_context,
+                ",".join(sorted(skip or ()))
+            )).encode("utf-8")
+        ).hexdigest()
+        return request, reference_time, message_timezone, cache_key
+    
+    def _extract_analysis(self, response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Parse and normalize the analyze_message tool call from a completion
         
-        # Parse function call response
+        Returns:
+            Extraction with all fields present, or None when the response is unusable
+        """
         try:
-            function_call = response.get("function_call")
-            if function_call and function_call.name == "analyze_message":
-                result = json.loads(function_call.arguments)
-                
-                # Ensure all required fields are present with defaults
-                result = self._ensure_complete_analysis(result)
+            for tool_call in response.get("tool_calls") or ():
+                if tool_call.function.name == "analyze_message":
+                    # Ensure all required fields are present with defaults
+                    return self._ensure_complete_analysis(json_loads(tool_call.function.arguments))
+            logger.warning("Unexpected response format: %s", response)
+        except (JSONDecodeError, AttributeError) as e:
+            logger.warning("Failed to parse tool call response: %s (response was: %s)", e, response)
+        return None
+    
+    def _finalize_analysis(
+        self,
+        result: Dict[str, Any],
+        reference_time: datetime,
+        message_timezone: Optional[Any],
+        user_calendar: Optional[List[Dict[str, Any]]],
+        user_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Resolve dates and run the conflict check on a (possibly cached) extraction"""
+        try:
+            # POST-PROCESS: Parse date expressions using dateparser
+            result = self._parse_date_expressions(result, reference_time, message_timezone)
+            
+            # CONFLICT DETECTION: Check for calendar conflicts using Pinecone
+            calendar = result["calendar"]
+            if calendar["detected"]:
+                # Use provided user_id or extract from user_calendar, otherwise use a default
+                conflict_user_id = user_id or "test_user"  # Use provided user_id first
+                if not conflict_user_id and user_calendar and len(user_calendar) > 0:
+                    conflict_user_id = user_calendar[0].get("user_id", "test_user")
                 
-                # POST-PROCESS: Parse date expressions using dateparser
-                result = self._parse_date_expressions(result, reference_time, message_timezone)
+                # Check if we have all required fields for conflict detection
+                if calendar["date"] and calendar["startTime"] and calendar["endTime"]:
+                    # Check for conflicts using Pinecone
+                    conflict_analysis = self._check_calendar_conflicts_pinecone(
+                        {
+                            "title": calendar["title"],
+                            "date": calendar["date"],
+                            "startTime": calendar["startTime"],
+                            "endTime": calendar["endTime"],
+                            "location": calendar["location"]
+                        },
+                        conflict_user_id
+                    )
                 
-                # CONFLICT DETECTION: Check for calendar conflicts using Pinecone
-                if result["calendar"]["detected"]:
-                    # Use provided user_id or extract from user_calendar, otherwise use a default
-                    conflict_user_id = user_id or "test_user"  # Use provided user_id first
-                    if not conflict_user_id and user_calendar and len(user_calendar) > 0:
-                        conflict_user_id = user_calendar[0].get("user_id", "test_user")
-                    
-                    # Check if we have all required fields for conflict detection
-                    if result["calendar"]["date"] and result["calendar"]["startTime"] and result["calendar"]["endTime"]:
-                        # Check for conflicts using Pinecone
-                        conflict_analysis = self._check_calendar_conflicts_pinecone(
-                            {
-                                "title": result["calendar"]["title"],
-                                "date": result["calendar"]["date"],
-                                "startTime": result["calendar"]["startTime"],
-                                "endTime": result["calendar"]["endTime"],
-                                "location": result["calendar"]["location"]
-                            },
-                            conflict_user_id
-                        )
-                        
-                        # Update conflict section with Pinecone results
-                        result["conflict"]["detected"] = conflict_analysis["has_conflicts"]
-                        result["conflict"]["conflicting_events"] = conflict_analysis["conflicts"]
-                        result["conflict"]["reasoning"] = conflict_analysis["reasoning"]
-                        result["conflict"]["same_event_detected"] = conflict_analysis["same_event_detected"]
-                        
-                        # Update calendar section with similar events
-                        result["calendar"]["similar_events"] = conflict_analysis.get("similar_events", [])
+                    # Update conflict section with Pinecone results
+                    conflict = result["conflict"]
+                    conflict["detected"] = conflict_analysis["has_conflicts"]
+                    conflict["conflicting_events"] = conflict_analysis["conflicts"]
+                    conflict["reasoning"] = conflict_analysis["reasoning"]
+                    conflict["same_event_detected"] = conflict_analysis["same_event_detected"]
                 
-                return result
-            else:
-                print(f"Unexpected response format: {response}")
-                return self._get_default_analysis()
-        except (json.JSONDecodeError, KeyError, AttributeError) as e:
-            print(f"Failed to parse function call response: {e}")
-            print(f"Response was: {response}")
+                    # Update calendar section with similar events
+                    calendar["similar_events"] = conflict_analysis.get("similar_events", [])
+            
+            return result
+        except (KeyError, AttributeError) as e:
+            logger.warning("Failed to post-process analysis: %s", e)
             return self._get_default_analysis()
 
     def _get_default_analysis(self) -> Dict[str, Any]:
         """Return default empty analysis structure"""
-        return {
-            "calendar": {"detected": False, "title": None, "date_expression": None, "startTime": None, "endTime": None, "duration": None, "location": None, "is_invitation": False},
-            "reminder": {"detected": False, "title": None, "date_expression": None},
-            "decision": {"detected": False, "text": None},
-            "rsvp": {"detected": False, "status": None, "event_reference": None},
-            "priority": {"detected": False, "level": None, "reason": None},
-            "conflict": {
-                "detected": False, 
-                "conflicting_events": [],
-                "calendar_conflicts": [],
-                "alternatives": [],
-                "reasoning": ""
-            }
-        }
+        return copy.deepcopy(_EMPTY_RESULT)
 
     def _ensure_complete_analysis(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """Ensure all required fields are present in the analysis result"""
-        # Define complete field structure
-        complete_structure = {
-            "calendar": {
-                "detected": False, "title": None, "date_expression": None, 
-                "startTime": None, "endTime": None, "duration": None, "location": None, "is_invitation": False
-            },
-            "reminder": {
-                "detected": False, "title": None, "date_expression": None
-            },
-            "decision": {
-                "detected": False, "text": None, "temporal_context": None
-            },
-            "rsvp": {
-                "detected": False, "status": None, "event_reference": None, "temporal_context": None
-            },
-            "priority": {
-                "detected": False, "level": None, "reason": None, "deadline_expression": None
-            },
-            "conflict": {
-                "detected": False, "conflicting_events": []
-            }
-        }
-        
         # Merge result with complete structure, ensuring all fields exist
-        for category, fields in complete_structure.items():
-            if category not in result:
-                result[category] = fields.copy()
-            else:
-                for field, default_value in fields.items():
-                    if field not in result[category]:
-                        result[category][field] = default_value
+        # (values from the model win; one C-level dict merge per category)
+        for category, fields in self._ANALYSIS_DEFAULTS.items():
+            result[category] = {**fields, **(result.get(category) or {})}
+        result["key_points"] = result.get("key_points") or []
+        
+        # Share one string object per known priority level / RSVP status
+        for category, field in (("priority", "level"), ("rsvp", "status"), ("sentiment", "sentiment")):
+            value = result[category][field]
+            if isinstance(value, str):
+                result[category][field] = _INTERNED_VALUES.get(value, value)
         
         return result
 
@@ -532,37 +1739,8 @@ Analyze the message and use the analyze_message function to return structured re
         Returns:
             Text with acronyms expanded to full phrases
         """
-        # Dictionary of acronyms and their expansions
-        acronym_expansions = {
-            # Business time acronyms
-            'EOD': 'end of day',
-            'EOB': 'end of business',
-            'COB': 'close of business', 
-            'EOW': 'end of week',
-            'EOQ': 'end of quarter',
-            'EOY': 'end of year',
-            
-            # Urgency acronyms
-            'ASAP': 'as soon as possible',
-            'URGENT': 'urgent',
-            
-            # Time-specific expansions (case-insensitive)
-            'eod': 'end of day',
-            'eob': 'end of business',
-            'cob': 'close of business',
-            'eow': 'end of week',
-            'asap': 'as soon as possible',
-        }
-        
-        # Apply expansions (case-insensitive)
-        expanded_text = text
-        for acronym, expansion in acronym_expansions.items():
-            # Use word boundaries to avoid partial matches
-            import re
-            pattern = r'\b' + re.escape(acronym) + r'\b'
-            expanded_text = re.sub(pattern, expansion, expanded_text, flags=re.IGNORECASE)
-        
-        return expanded_text
+        # Single pass with word boundaries to avoid partial matches (case-insensitive)
+        return _ACRONYM_RE.sub(lambda match: _ACRONYM_EXPANSIONS[match.group(1).lower()], text)
 
     def _parse_date_expressions(self, result: Dict[str, Any], reference_time, message_timezone=None) -> Dict[str, Any]:
         """
@@ -576,15 +1754,29 @@ Analyze the message and use the analyze_message function to return structured re
         Returns:
             Updated result with parsed date fields for all relevant detection types
         """
-        import dateparser
-        from datetime import timedelta
+        # Bind sections once; each is read and written several times below
+        calendar = result["calendar"]
+        decision = result["decision"]
+        rsvp = result["rsvp"]
+        priority = result["priority"]
+        conflict = result["conflict"]
         
-        # Common dateparser settings with timezone awareness
-        dateparser_settings = {
-            'RELATIVE_BASE': reference_time,
-            'PREFER_DATES_FROM': 'future',  # Always interpret as future dates
-            'RETURN_AS_TIMEZONE_AWARE': False
-        }
+        # Fast path for the common no-detection case: every derived field is None,
+        # so skip reference formatting, timezone handling and parsing entirely
+        if not _needs_resolution(result):
+            calendar["date"] = None
+            calendar["duration"] = None
+            for section, _, _, out_key, _, _ in _TEMPORAL_FIELDS:
+                result[section][out_key] = None
+            conflict["detected_at"] = None
+            return result
+        
+        # Format the reference time once; most branches fall back to it
+        ref_str = _format_timestamp(reference_time)
+        
+        # Reference time for relative parsing (timezone-aware when available).
+        # All parsing prefers future dates and goes through the memoized _parse_date.
+        relative_base = reference_time
         
         # Add timezone context if available
         if message_timezone:
@@ -599,21 +1791,21 @@ Analyze the message and use the analyze_message function to return structured re
                     tz_mins = int(message_timezone[3:5]) if len(message_timezone) > 3 else 0
                 
                 # Create timezone-aware reference time
-                from datetime import timezone, timedelta
                 tz_offset = timezone(timedelta(hours=tz_hours, minutes=tz_mins))
                 reference_time_tz = reference_time.replace(tzinfo=tz_offset)
                 
-                # Update settings to use timezone-aware reference
-                dateparser_settings['RELATIVE_BASE'] = reference_time_tz
-                print(f"🌍 Using timezone-aware reference: {reference_time_tz}")
+                # Use timezone-aware reference for relative parsing
+                relative_base = reference_time_tz
+                logger.debug("🌍 Using timezone-aware reference: %s", reference_time_tz)
                 
             except Exception as e:
                 # Failed to parse timezone, use default reference
                 pass
         
         # Parse calendar date expression with enhanced relative date handling
-        if result["calendar"]["detected"] and result["calendar"]["date_expression"]:
-            date_expr = result["calendar"]["date_expression"]
+        if calendar["detected"] and calendar["date_expression"]:
+            # Lowercase once; dateparser is case-insensitive and every check below is too
+            date_expr = calendar["date_expression"].lower()
             
             # Manual mapping for common expressions that dateparser might not handle well
             manual_mappings = {
@@ -624,210 +1816,121 @@ Analyze the message and use the analyze_message function to return structured re
             }
             
             # Use manual mapping if available
-            if date_expr.lower() in manual_mappings:
-                date_expr = manual_mappings[date_expr.lower()]
-            
-            # Enhanced settings for better relative date parsing
-            enhanced_settings = dateparser_settings.copy()
-            enhanced_settings.update({
-                'PREFER_DATES_FROM': 'future',
-                'RELATIVE_BASE': reference_time,
-                'RETURN_AS_TIMEZONE_AWARE': False,
-                'PARSERS': ['relative-time', 'absolute-time', 'timestamp']
-            })
+            date_expr = manual_mappings.get(date_expr, date_expr)
             
             # Special handling for "next [day]" expressions
-            if date_expr.lower().startswith('next '):
-                # Try multiple parsing strategies for "next [day]"
-                parsing_attempts = [
-                    date_expr,  # Original: "next Tuesday"
-                    f"next {date_expr.split(' ', 1)[1]}",  # Ensure "next" prefix
-                    f"next {date_expr.split(' ', 1)[1]} from {reference_time.strftime('%Y-%m-%d')}",  # With explicit date
-                ]
-                
-                # Add day-specific attempts
-                day_name = date_expr.split(' ', 1)[1].lower() if ' ' in date_expr else ''
-                if day_name in ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']:
-                    # Try different formats
-                    parsing_attempts.extend([
-                        f"next {day_name}",
-                        f"next {day_name} from {reference_time.strftime('%Y-%m-%d')}",
-                        f"next {day_name} at 12:00",  # Add time context
-                    ])
-                
-                parsed_date = None
-                for attempt in parsing_attempts:
-                    try:
-                        parsed_date = dateparser.parse(attempt, settings=enhanced_settings)
-                        if parsed_date:
-                            break
-                    except Exception as e:
-                        # Continue to next attempt
-                        pass
-                        continue
-                
-                # Final fallback: manual calculation for "next [day]"
-                if not parsed_date and day_name in ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']:
-                    try:
-                        from datetime import timedelta
-                        import calendar
-                        
-                        # Get current weekday (0=Monday, 6=Sunday)
-                        current_weekday = reference_time.weekday()
-                        target_weekday = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'].index(day_name)
-                        
-                        # Calculate days until next occurrence
-                        days_ahead = target_weekday - current_weekday
-                        if days_ahead <= 0:  # Target day is this week or past
-                            days_ahead += 7  # Move to next week
-                        
-                        next_date = reference_time + timedelta(days=days_ahead)
-                        parsed_date = next_date
-                    except Exception as e:
-                        # Manual fallback failed
-                        pass
+            day_name = date_expr.split(' ', 1)[1] if date_expr.startswith('next ') else ''
+            if day_name in _WEEKDAY_INDEX:
+                # dateparser can't parse "next [weekday]" in any phrasing; it means the
+                # weekday's next occurrence (1-7 days ahead), same as the bare weekday
+                parsed_date = _parse_date(day_name, reference_time)
             else:
-                parsed_date = dateparser.parse(date_expr, settings=enhanced_settings)
+                parsed_date = _parse_date(date_expr, reference_time, _CALENDAR_PARSERS)
             
-            result["calendar"]["date"] = parsed_date.strftime('%Y-%m-%d') if parsed_date else None
+            calendar["date"] = _format_date(parsed_date) if parsed_date else None
         else:
-            result["calendar"]["date"] = None
+            calendar["date"] = None
         
         # CRITICAL: Apply 1-hour default duration if endTime not specified
-        if result["calendar"]["detected"] and result["calendar"]["startTime"]:
-            start_time = result["calendar"]["startTime"]
-            end_time = result["calendar"]["endTime"]
+        if calendar["detected"] and calendar["startTime"]:
+            start_time = calendar["startTime"]
+            end_time = calendar["endTime"]
             
             # Enhanced time parsing with dateparser for robustness
             start_time = self._parse_time_with_fallback(start_time, reference_time)
-            result["calendar"]["startTime"] = start_time
+            calendar["startTime"] = start_time
             
+            # Carry (hour, minute) pairs through so no clock string is parsed twice
+            start = _parse_clock(start_time)
+            end = None
             if not end_time:
                 # Apply 1-hour default
-                try:
-                    start_hour, start_minute = map(int, start_time.split(':'))
-                    end_hour = (start_hour + 1) % 24
-                    end_time = f"{end_hour:02d}:{start_minute:02d}"
-                    result["calendar"]["endTime"] = end_time
-                except (ValueError, AttributeError) as e:
-                    result["calendar"]["endTime"] = None
+                if not start:
+                    end_time = None
+                else:
+                    end = ((start[0] + 1) % 24, start[1])
+                    if 0 <= end[1] < 60:
+                        end_time = _CLOCK_TIMES[end[0] * 60 + end[1]]
+                    else:
+                        # Out-of-range minutes passed through from the model
+                        end_time = f"{end[0]:02d}:{end[1]:02d}"
+                calendar["endTime"] = end_time
             else:
                 # Parse end time with fallback
                 end_time = self._parse_time_with_fallback(end_time, reference_time)
-                result["calendar"]["endTime"] = end_time
+                calendar["endTime"] = end_time
             
             # Calculate duration in minutes
             if start_time and end_time:
-                try:
-                    start_hour, start_minute = map(int, start_time.split(':'))
-                    end_hour, end_minute = map(int, end_time.split(':'))
-                    start_minutes = start_hour * 60 + start_minute
-                    end_minutes = end_hour * 60 + end_minute
-                    
+                end = end or _parse_clock(end_time)
+                if start and end:
+                    duration = (end[0] * 60 + end[1]) - (start[0] * 60 + start[1])
                     # Handle overnight events (end time is next day)
-                    if end_minutes < start_minutes:
-                        end_minutes += 24 * 60
-                    
-                    duration = end_minutes - start_minutes
-                    result["calendar"]["duration"] = duration
-                except (ValueError, AttributeError) as e:
-                    result["calendar"]["duration"] = 60  # Default to 1 hour
+                    calendar["duration"] = duration + 24 * 60 if duration < 0 else duration
+                else:
+                    calendar["duration"] = 60  # Default to 1 hour
         else:
-            result["calendar"]["duration"] = None
+            calendar["duration"] = None
         
-        # Parse reminder date expression
-        if result["reminder"]["detected"] and result["reminder"]["date_expression"]:
-            date_expr = result["reminder"]["date_expression"]
-            parsed_date = dateparser.parse(date_expr, settings=dateparser_settings)
-            result["reminder"]["due_date"] = parsed_date.strftime('%Y-%m-%d') if parsed_date else None
-        else:
-            result["reminder"]["due_date"] = None
-        
-        # Parse decision timestamp (when the decision was made)
-        if result["decision"]["detected"] and result["decision"]["text"]:
-            # Use temporal_context if provided by AI, otherwise extract from decision text
-            temporal_context = result["decision"].get("temporal_context")
-            if temporal_context:
-                parsed_date = dateparser.parse(temporal_context, settings=dateparser_settings)
-                result["decision"]["timestamp"] = parsed_date.strftime('%Y-%m-%d %H:%M:%S') if parsed_date else reference_time.strftime('%Y-%m-%d %H:%M:%S')
-            else:
-                # Fallback: look for temporal indicators in decision text
-                decision_text = result["decision"]["text"]
-                temporal_indicators = ["yesterday", "today", "earlier", "just now", "recently", "earlier today"]
-                for indicator in temporal_indicators:
-                    if indicator in decision_text.lower():
-                        parsed_date = dateparser.parse(indicator, settings=dateparser_settings)
-                        if parsed_date:
-                            result["decision"]["timestamp"] = parsed_date.strftime('%Y-%m-%d %H:%M:%S')
-                            break
+        # Parse explicit temporal expressions returned by the model (reminder due date,
+        # when a decision/RSVP happened, priority deadline); sections without one are
+        # resolved by the text fallbacks below
+        pending = set()
+        for section, active, expr_key, out_key, formatter, unparsed_default in _TEMPORAL_FIELDS:
+            node = result[section]
+            if not active(node):
+                node[out_key] = None
+                continue
+            expression = node.get(expr_key)
+            if expression:
+                parsed_date = _parse_date(expression, relative_base)
+                if parsed_date:
+                    node[out_key] = formatter(parsed_date)
                 else:
-                    # Default to current time if no temporal context found
-                    result["decision"]["timestamp"] = reference_time.strftime('%Y-%m-%d %H:%M:%S')
-        else:
-            result["decision"]["timestamp"] = None
-        
-        # Parse RSVP timestamp (when the response was given)
-        if result["rsvp"]["detected"]:
-            # Use temporal_context if provided by AI
-            temporal_context = result["rsvp"].get("temporal_context")
-            if temporal_context:
-                parsed_date = dateparser.parse(temporal_context, settings=dateparser_settings)
-                result["rsvp"]["timestamp"] = parsed_date.strftime('%Y-%m-%d %H:%M:%S') if parsed_date else reference_time.strftime('%Y-%m-%d %H:%M:%S')
+                    node[out_key] = ref_str if unparsed_default is _REFERENCE else unparsed_default
             else:
-                # Fallback: check for temporal context in status
-                rsvp_text = result["rsvp"]["status"] or ""
-                if any(word in rsvp_text.lower() for word in ["yesterday", "earlier", "just now"]):
-                    parsed_date = dateparser.parse(rsvp_text, settings=dateparser_settings)
-                    result["rsvp"]["timestamp"] = parsed_date.strftime('%Y-%m-%d %H:%M:%S') if parsed_date else reference_time.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    result["rsvp"]["timestamp"] = reference_time.strftime('%Y-%m-%d %H:%M:%S')
-        else:
-            result["rsvp"]["timestamp"] = None
-        
-        # Parse priority deadline (when the urgent task is due)
-        if result["priority"]["detected"] and result["priority"]["level"] in ["high", "medium"]:
-            # Use deadline_expression if provided by AI
-            deadline_expression = result["priority"].get("deadline_expression")
-            if deadline_expression:
-                parsed_date = dateparser.parse(deadline_expression, settings=dateparser_settings)
-                result["priority"]["deadline"] = parsed_date.strftime('%Y-%m-%d %H:%M:%S') if parsed_date else None
+                pending.add(section)
+        
+        # Decision fallback: look for temporal indicators in decision text
+        if "decision" in pending:
+            parsed_date = _parse_first_match(
+                _TEMPORAL_INDICATOR_RE, decision["text"], 1, relative_base
+            )
+            # Default to current time if no temporal context found
+            decision["timestamp"] = _format_timestamp(parsed_date) if parsed_date else ref_str
+        
+        # RSVP fallback: check for temporal context in status
+        if "rsvp" in pending:
+            rsvp_text = rsvp["status"] or ""
+            if _RSVP_TEMPORAL_RE.search(rsvp_text):
+                parsed_date = _parse_date(rsvp_text, relative_base)
+                rsvp["timestamp"] = _format_timestamp(parsed_date) if parsed_date else ref_str
             else:
-                # Fallback: look for deadline indicators in reason
-                priority_text = result["priority"]["reason"] or ""
-                deadline_indicators = ["by", "before", "until", "deadline", "due"]
-                for indicator in deadline_indicators:
-                    if indicator in priority_text.lower():
-                        # Try to extract and parse the deadline
-                        import re
-                        deadline_match = re.search(rf'{indicator}\s+([^,\.]+)', priority_text, re.IGNORECASE)
-                        if deadline_match:
-                            deadline_expr = deadline_match.group(1).strip()
-                            parsed_date = dateparser.parse(deadline_expr, settings=dateparser_settings)
-                            if parsed_date:
-                                result["priority"]["deadline"] = parsed_date.strftime('%Y-%m-%d %H:%M:%S')
-                                break
-                else:
-                    # Default deadline based on priority level
-                    if result["priority"]["level"] == "high":
-                        # High priority: 1 hour from now
-                        deadline = reference_time + timedelta(hours=1)
-                        result["priority"]["deadline"] = deadline.strftime('%Y-%m-%d %H:%M:%S')
-                    elif result["priority"]["level"] == "medium":
-                        # Medium priority: end of day
-                        from datetime import datetime, time
-                        eod = datetime.combine(reference_time.date(), time(23, 59, 59))
-                        result["priority"]["deadline"] = eod.strftime('%Y-%m-%d %H:%M:%S')
-                    else:
-                        result["priority"]["deadline"] = None
-        else:
-            result["priority"]["deadline"] = None
+                rsvp["timestamp"] = ref_str
+        
+        # Priority fallback: look for deadline indicators in reason
+        if "priority" in pending:
+            # Try to parse the expression following each indicator
+            parsed_date = _parse_first_match(
+                _DEADLINE_RE, priority["reason"] or "", 2, relative_base
+            )
+            if parsed_date:
+                priority["deadline"] = _format_timestamp(parsed_date)
+            elif priority["level"] == "high":
+                # High priority: 1 hour from now
+                deadline = reference_time + _ONE_HOUR
+                priority["deadline"] = _format_timestamp(deadline)
+            else:
+                # Medium priority: end of day
+                eod = reference_time.replace(hour=23, minute=59, second=59, microsecond=0)
+                priority["deadline"] = _format_timestamp(eod)
         
         # Parse conflict timestamps (when conflicts occur)
-        if result["conflict"]["detected"] and result["conflict"]["conflicting_events"]:
+        if conflict["detected"] and conflict["conflicting_events"]:
             # Conflicts are typically about future events, so use current time as reference
-            result["conflict"]["detected_at"] = reference_time.strftime('%Y-%m-%d %H:%M:%S')
+            conflict["detected_at"] = ref_str
         else:
-            result["conflict"]["detected_at"] = None
+            conflict["detected_at"] = None
         
         return result
     
@@ -843,8 +1946,6 @@ Analyze the message and use the analyze_message function to return structured re
         Returns:
             Time in HH:MM format (24-hour)
         """
-        import dateparser
-        
         # If already in HH:MM format, return as is
         if time_str and ':' in time_str and len(time_str.split(':')[0]) <= 2:
             try:
@@ -856,57 +1957,35 @@ Analyze the message and use the analyze_message function to return structured re
             except (ValueError, IndexError):
                 pass
         
+        # Fast path: named times and 12-hour clock times
+        if time_str:
+            time_lower = time_str.lower().strip()
+            named = _NAMED_TIMES.get(time_lower)
+            if named:
+                return named
+            match = _TIME_RE.fullmatch(time_lower)
+            if match:
+                hour = int(match.group(1))
+                minute = int(match.group(2) or 0)
+                if 1 <= hour <= 12 and minute <= 59:
+                    hour = hour % 12 + (12 if match.group(3)[0] == 'p' else 0)
+                    return f"{hour:02d}:{minute:02d}"
+        
         # Use dateparser for natural language times
         try:
-            parsed = dateparser.parse(
-                time_str,
-                settings={
-                    'RELATIVE_BASE': reference_time,
-                    'PREFER_DATES_FROM': 'future',
-                    'RETURN_AS_TIMEZONE_AWARE': False
-                }
-            )
+            parsed = _parse_date(time_str, reference_time)
             if parsed:
-                return parsed.strftime('%H:%M')
+                return f"{parsed.hour:02d}:{parsed.minute:02d}"
         except Exception as e:
             # dateparser failed, continue with fallback
-            pass
+            logger.debug("dateparser failed for %r: %s", time_str, e)
         
-        # Fallback: Handle common vague time expressions
+        # Fallback: named times inside compound expressions like "in the evening"
         if time_str:
-            # Normalize the time string
-            time_lower = time_str.lower().strip()
-            
-            # Handle compound expressions like "in the evening"
-            if 'evening' in time_lower:
-                return '19:00'  # 7pm
-            elif 'morning' in time_lower:
-                return '09:00'  # 9am
-            elif 'afternoon' in time_lower:
-                return '15:00'  # 3pm
-            elif 'night' in time_lower:
-                return '20:00'  # 8pm
-            elif 'late' in time_lower:
-                return '22:00'  # 10pm
-            elif 'early' in time_lower:
-                return '08:00'  # 8am
-            elif 'noon' in time_lower:
-                return '12:00'  # 12pm
-            elif 'midnight' in time_lower:
-                return '00:00'  # 12am
-            
-            # Simple mappings
-            vague_times = {
-                'evening': '19:00',
-                'morning': '09:00',
-                'afternoon': '15:00',
-                'night': '20:00',
-                'late': '22:00',
-                'early': '08:00',
-                'noon': '12:00',
-                'midnight': '00:00'
-            }
-            return vague_times.get(time_lower, time_str)
+            for word in _NAMED_TIME_PRIORITY:
+                if word in time_lower:
+                    return _NAMED_TIMES[word]
+            return time_str
         
         return None
     
@@ -922,14 +2001,13 @@ Analyze the message and use the analyze_message function to return structured re
             Dictionary with conflict analysis
         """
         try:
-            from app.services.event_indexing_service import get_event_indexing_service
-            
             event_service = get_event_indexing_service()
             result = event_service.search_conflicts(detected_event, user_id)
             return result
             
         except Exception as e:
             # Log error but don't print traceback in production
+            logger.warning("Conflict detection unavailable: %s", e)
             return {
                 "has_conflicts": False,
                 "conflicts": [],
@@ -940,9 +2018,7 @@ Analyze the message and use the analyze_message function to return structured re
 
 
 # Singleton instance
-_openai_service_instance = None
-
-
+@lru_cache(maxsize=1)
 def get_openai_service() -> OpenAIService:
     """
     Get or create the OpenAIService singleton instance
@@ -950,10 +2026,4 @@ def get_openai_service() -> OpenAIService:
     Returns:
         OpenAIService instance
     """
-    global _openai_service_instance
-    if _openai_service_instance is None:
-        _openai_service_instance = OpenAIService()
-    return _openai_service_instance
-
-
-
+    return OpenAIService()
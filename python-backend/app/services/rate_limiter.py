@@ -0,0 +1,167 @@
+"""
+Rate Limiter
+Client-side concurrency, request and token budgets for async OpenAI calls
+"""
+import asyncio
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Mapping, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding once; None when tiktoken or its data is unavailable"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.debug("tiktoken unavailable, estimating tokens from length: %s", e)
+        return None
+
+
+@lru_cache(maxsize=1024)
+def estimate_tokens(text: str) -> int:
+    """
+    Count tokens in text for budgeting purposes
+    
+    Args:
+        text: Text to measure
+    
+    Returns:
+        Exact token count when tiktoken is available, otherwise ~4 characters per token
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+
+class TokenBucket:
+    """Continuously refilling budget of units per minute (requests or tokens)"""
+    
+    def __init__(self, per_minute: int):
+        """
+        Initialize a full bucket
+        
+        Args:
+            per_minute: Bucket capacity and refill rate per minute
+        """
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.available = float(per_minute)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, amount: float = 1) -> None:
+        """
+        Wait until amount units are available, then take them
+        
+        Args:
+            amount: Units to take (clamped to capacity so oversized requests still run)
+        """
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.available >= amount:
+                    self.available -= amount
+                    return
+                await asyncio.sleep((amount - self.available) / self.rate)
+    
+    def observe(self, remaining: float) -> None:
+        """
+        Lower the local budget to a server-reported remaining amount
+        
+        Args:
+            remaining: Units the server says are left in the current window
+        """
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate, remaining)
+        self.updated = now
+
+
+class RateLimiter:
+    """
+    Preemptive limiter for OpenAI calls.
+    Bounds in-flight requests and spends request/token budgets before a call starts,
+    so bursts queue locally instead of turning into 429 storms.
+    """
+    
+    def __init__(
+        self,
+        max_concurrent_requests: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        jitter: Optional[float] = None
+    ):
+        """
+        Initialize limiter; unspecified limits are read from the environment
+        
+        Args:
+            max_concurrent_requests: Max in-flight requests (OPENAI_MAX_CONCURRENCY, default 20)
+            requests_per_minute: Request budget (OPENAI_REQUESTS_PER_MINUTE, default 500, 0 disables)
+            tokens_per_minute: Token budget (OPENAI_TOKENS_PER_MINUTE, default 200000, 0 disables)
+            jitter: Max random delay in seconds before each request (OPENAI_REQUEST_JITTER, default 0.05)
+        """
+        if max_concurrent_requests is None:
+            max_concurrent_requests = int(os.getenv("OPENAI_MAX_CONCURRENCY", "20"))
+        if requests_per_minute is None:
+            requests_per_minute = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500"))
+        if tokens_per_minute is None:
+            tokens_per_minute = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "200000"))
+        if jitter is None:
+            jitter = float(os.getenv("OPENAI_REQUEST_JITTER", "0.05"))
+        
+        self.max_concurrent_requests = max_concurrent_requests
+        self.jitter = jitter
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+    
+    @asynccontextmanager
+    async def limit(self, tokens: int = 0) -> AsyncIterator[None]:
+        """
+        Hold a request slot for the duration of an API call
+        
+        Args:
+            tokens: Estimated tokens the call will consume (prompt + completion)
+        """
+        if self.jitter:
+            # Spread simultaneous starts to avoid a thundering herd (before taking a slot)
+            await asyncio.sleep(random.uniform(0, self.jitter))
+        async with self._semaphore:
+            if self._requests:
+                await self._requests.acquire(1)
+            if self._tokens and tokens:
+                await self._tokens.acquire(tokens)
+            yield
+    
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Sync the budgets with OpenAI's x-ratelimit-remaining-* response headers,
+        so traffic from other processes sharing the key slows this one down too
+        
+        Args:
+            headers: Response headers of a completed API call
+        """
+        for bucket, header in (
+            (self._requests, "x-ratelimit-remaining-requests"),
+            (self._tokens, "x-ratelimit-remaining-tokens"),
+        ):
+            value = headers.get(header)
+            if bucket is None or value is None:
+                continue
+            try:
+                bucket.observe(float(value))
+            except ValueError:
+                logger.debug("Ignoring malformed %s header: %r", header, value)
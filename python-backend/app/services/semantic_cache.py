@@ -0,0 +1,358 @@
+"""
+Semantic Cache
+Nearest-neighbour cache of analysis extractions for near-duplicate messages, shared through Redis
+"""
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Set, Union
+import logging
+
+import numpy as np
+import numpy.typing as npt
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    from json import dumps as json_dumps, loads as json_loads
+
+try:
+    import redis
+    import redis.asyncio as redis_asyncio
+except ImportError:  # Redis is optional; entries then stay in this process
+    redis = None
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+# Default lifetime of a cached extraction
+DEFAULT_TTL_SECONDS = 60 * 60
+
+# Entries kept per scope (user); the oldest entry is overwritten when full
+DEFAULT_MAX_ENTRIES = 512
+
+# Scopes held in process; the least recently used scope is dropped when full
+DEFAULT_MAX_SCOPES = 1024
+
+# Rows a bucket starts with; doubled as entries arrive, up to max_entries
+_INITIAL_BUCKET_ROWS = 8
+
+# How often a process reloads a scope from Redis to pick up other workers' entries
+DEFAULT_REFRESH_SECONDS = 60
+
+# Entries read per Redis round trip when refreshing a scope
+_REFRESH_PAGE_SIZE = 32
+
+# Redis entry header: wall-clock store time and vector dimensions
+_ENTRY_HEADER = struct.Struct("<dI")
+
+# Leading bytes identifying an entry (header plus the first vector components)
+_ENTRY_ID_SIZE = _ENTRY_HEADER.size + 16
+
+
+class _Bucket:
+    """Ring buffer of unit-length embeddings and their serialized extractions for one scope"""
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.vectors: Optional[npt.NDArray[np.float32]] = None  # Allocated on first insert
+        self.stored_at = np.empty(0)
+        self.extractions: List[Any] = []
+        self.entry_ids: List[bytes] = []
+        self.known: Set[bytes] = set()  # IDs of the entries currently held
+        self.size = 0
+        self.next_slot = 0
+        self.loaded_at: Optional[float] = None  # Last reload from Redis (monotonic)
+        self.watermark: Optional[bytes] = None  # ID of the newest Redis entry seen by a reload
+    
+    @property
+    def dimensions(self) -> Optional[int]:
+        """Vector dimensions, or None before the first insert"""
+        return None if self.vectors is None else self.vectors.shape[1]
+    
+    def insert(
+        self,
+        vector: npt.NDArray[np.float32],
+        stored_at: float,
+        raw: Union[bytes, str],
+        entry_id: bytes
+    ) -> None:
+        """Write an entry over the oldest slot, growing the buffer until it reaches capacity"""
+        if self.vectors is None:
+            rows = min(_INITIAL_BUCKET_ROWS, self.capacity)
+            self.vectors = np.zeros((rows, vector.shape[0]), dtype=np.float32)
+            self.stored_at = np.full(rows, -np.inf)
+        elif self.size == len(self.vectors) < self.capacity:
+            added = min(len(self.vectors), self.capacity - len(self.vectors))
+            self.vectors = np.concatenate((self.vectors, np.zeros((added, self.vectors.shape[1]), dtype=np.float32)))
+            self.stored_at = np.concatenate((self.stored_at, np.full(added, -np.inf)))
+        slot = self.next_slot
+        self.vectors[slot] = vector
+        self.stored_at[slot] = stored_at
+        if slot < len(self.extractions):
+            self.known.discard(self.entry_ids[slot])
+            self.extractions[slot] = raw
+            self.entry_ids[slot] = entry_id
+        else:
+            self.extractions.append(raw)
+            self.entry_ids.append(entry_id)
+        self.known.add(entry_id)
+        self.next_slot = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+
+class SemanticAnalysisCache:
+    """
+    Serves a cached extraction when a new message embeds within a cosine-similarity
+    threshold of a recently analyzed one. Disabled unless a threshold is configured.
+    
+    With Redis configured, every entry is also pushed to a capped per-scope list, and
+    each process periodically pulls the entries it hasn't seen yet, so all workers
+    share hits and entries survive restarts. Fails open: Redis errors are logged and ignored.
+    """
+    
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        url: Optional[str] = None,
+        namespace: str = "",
+        refresh_seconds: float = DEFAULT_REFRESH_SECONDS,
+        max_scopes: int = DEFAULT_MAX_SCOPES
+    ):
+        """
+        Initialize cache
+        
+        Args:
+            threshold: Minimum cosine similarity for a hit (defaults to SEMANTIC_CACHE_THRESHOLD;
+                cache disabled when unset)
+            ttl_seconds: Maximum age of a usable entry
+            max_entries: Entries kept per scope
+            url: Redis URL (defaults to REDIS_URL; entries stay in-process when unset)
+            namespace: Redis key prefix component; include the model and prompt version so
+                schema changes never serve stale extractions
+            refresh_seconds: Minimum interval between reloads of a scope from Redis (each reload
+                reads only the entries pushed since the previous one)
+            max_scopes: Scopes held in process (least recently used are dropped)
+        """
+        if threshold is None:
+            configured = os.getenv("SEMANTIC_CACHE_THRESHOLD")
+            threshold = float(configured) if configured else None
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self.refresh_seconds = refresh_seconds
+        self.max_scopes = max_scopes
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._client = None
+        self._async_client = None
+        url = url or os.getenv("REDIS_URL")
+        if threshold is not None and url and redis is not None:
+            self._client = redis.Redis.from_url(url)
+            self._async_client = redis_asyncio.Redis.from_url(url)
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether a similarity threshold is configured"""
+        return self.threshold is not None
+    
+    def lookup(self, scope: str, embedding: npt.NDArray[np.float32]) -> Optional[Dict[str, Any]]:
+        """
+        Find the most similar fresh entry
+        
+        Args:
+            scope: Partition to search (e.g. user ID); entries never cross scopes
+            embedding: Embedding of the new message
+        
+        Returns:
+            Copy of the cached extraction, or None when nothing is similar enough
+        """
+        if self._client is not None and self._needs_refresh(scope):
+            try:
+                key = self._redis_key(scope)
+                entries: List[bytes] = []
+                more = True
+                while more:
+                    page = self._client.lrange(key, len(entries), len(entries) + _REFRESH_PAGE_SIZE - 1)
+                    more = self._collect(scope, page, entries)
+                self._load(scope, entries)
+            except Exception as e:
+                logger.warning("Semantic cache read failed: %s", e)
+        return self._search(scope, embedding)
+    
+    async def lookup_async(self, scope: str, embedding: npt.NDArray[np.float32]) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of lookup
+        
+        Args:
+            scope: Partition to search (e.g. user ID); entries never cross scopes
+            embedding: Embedding of the new message
+        
+        Returns:
+            Copy of the cached extraction, or None when nothing is similar enough
+        """
+        if self._async_client is not None and self._needs_refresh(scope):
+            try:
+                key = self._redis_key(scope)
+                entries: List[bytes] = []
+                more = True
+                while more:
+                    page = await self._async_client.lrange(key, len(entries), len(entries) + _REFRESH_PAGE_SIZE - 1)
+                    more = self._collect(scope, page, entries)
+                self._load(scope, entries)
+            except Exception as e:
+                logger.warning("Semantic cache read failed: %s", e)
+        return self._search(scope, embedding)
+    
+    def store(self, scope: str, embedding: npt.NDArray[np.float32], extraction: Dict[str, Any]) -> None:
+        """
+        Remember an extraction for future near-duplicates
+        
+        Args:
+            scope: Partition to store in (e.g. user ID)
+            embedding: Embedding of the analyzed message
+            extraction: Normalized model extraction
+        """
+        entry = self._insert(scope, embedding, extraction)
+        if self._client is None:
+            return
+        try:
+            key = self._redis_key(scope)
+            self._client.pipeline(transaction=False).lpush(key, entry).ltrim(
+                key, 0, self.max_entries - 1
+            ).expire(key, self.ttl_seconds).execute()
+        except Exception as e:
+            logger.warning("Semantic cache write failed: %s", e)
+    
+    async def store_async(self, scope: str, embedding: npt.NDArray[np.float32], extraction: Dict[str, Any]) -> None:
+        """
+        Async variant of store
+        
+        Args:
+            scope: Partition to store in (e.g. user ID)
+            embedding: Embedding of the analyzed message
+            extraction: Normalized model extraction
+        """
+        entry = self._insert(scope, embedding, extraction)
+        if self._async_client is None:
+            return
+        try:
+            key = self._redis_key(scope)
+            await self._async_client.pipeline(transaction=False).lpush(key, entry).ltrim(
+                key, 0, self.max_entries - 1
+            ).expire(key, self.ttl_seconds).execute()
+        except Exception as e:
+            logger.warning("Semantic cache write failed: %s", e)
+    
+    def clear(self) -> None:
+        """Drop all entries held by this process"""
+        with self._lock:
+            self._buckets.clear()
+    
+    def _search(self, scope: str, embedding: npt.NDArray[np.float32]) -> Optional[Dict[str, Any]]:
+        """Best in-process match for the embedding, decoded, or None"""
+        query = self._normalize(embedding)
+        with self._lock:
+            bucket = self._buckets.get(scope)
+            if bucket is None or bucket.size == 0:
+                return None
+            self._buckets.move_to_end(scope)
+            similarities = bucket.vectors[:bucket.size] @ query
+            similarities[bucket.stored_at[:bucket.size] < time.monotonic() - self.ttl_seconds] = -1.0
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            logger.debug("Semantic cache hit (similarity %.4f)", similarities[best])
+            raw = bucket.extractions[best]
+        # Decoding the stored JSON is several times cheaper than deepcopying the dict
+        return json_loads(raw)
+    
+    def _insert(self, scope: str, embedding: npt.NDArray[np.float32], extraction: Dict[str, Any]) -> bytes:
+        """Add an entry to the in-process bucket and return its Redis encoding"""
+        vector = self._normalize(embedding)
+        raw = json_dumps(extraction)
+        if isinstance(raw, str):
+            raw = raw.encode()
+        entry = _ENTRY_HEADER.pack(time.time(), vector.shape[0]) + vector.tobytes() + raw
+        with self._lock:
+            self._bucket(scope).insert(vector, time.monotonic(), raw, entry[:_ENTRY_ID_SIZE])
+        return entry
+    
+    def _collect(self, scope: str, page: Sequence[bytes], entries: List[bytes]) -> bool:
+        """
+        Append one page of a scope's Redis list (newest first) to entries
+        
+        Returns:
+            Whether the next page is needed, i.e. the page was full and reached
+            neither the last reload's newest entry, an expired entry nor max_entries
+        """
+        now = time.time()
+        with self._lock:
+            bucket = self._buckets.get(scope)
+            watermark = bucket.watermark if bucket is not None else None
+        for entry in page:
+            stored_at, _ = _ENTRY_HEADER.unpack_from(entry)
+            if entry[:_ENTRY_ID_SIZE] == watermark or now - stored_at > self.ttl_seconds:
+                return False
+            entries.append(entry)
+        return len(page) == _REFRESH_PAGE_SIZE and len(entries) < self.max_entries
+    
+    def _load(self, scope: str, entries: Sequence[bytes]) -> None:
+        """Merge (newest-first) entries read from Redis into a scope's bucket, skipping ones it holds"""
+        now = time.time()
+        monotonic_now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(scope)
+            if entries:
+                bucket.watermark = entries[0][:_ENTRY_ID_SIZE]
+            for entry in reversed(entries):
+                stored_at, dimensions = _ENTRY_HEADER.unpack_from(entry)
+                entry_id = entry[:_ENTRY_ID_SIZE]
+                if entry_id in bucket.known or bucket.dimensions not in (None, dimensions):
+                    continue
+                vector_end = _ENTRY_HEADER.size + dimensions * 4
+                bucket.insert(
+                    np.frombuffer(entry, dtype=np.float32, count=dimensions, offset=_ENTRY_HEADER.size),
+                    monotonic_now - (now - stored_at),
+                    entry[vector_end:],
+                    entry_id
+                )
+            bucket.loaded_at = monotonic_now
+    
+    def _needs_refresh(self, scope: str) -> bool:
+        """Whether this process's copy of a scope is missing or older than refresh_seconds"""
+        with self._lock:
+            bucket = self._buckets.get(scope)
+            loaded_at = bucket.loaded_at if bucket is not None else None
+        return loaded_at is None or time.monotonic() - loaded_at >= self.refresh_seconds
+    
+    def _bucket(self, scope: str) -> _Bucket:
+        """A scope's bucket, created if absent and marked most recently used (call with the lock held)"""
+        bucket = self._buckets.get(scope)
+        if bucket is None:
+            bucket = self._buckets[scope] = _Bucket(self.max_entries)
+            self._evict()
+        else:
+            self._buckets.move_to_end(scope)
+        return bucket
+    
+    def _evict(self) -> None:
+        """Drop least recently used scopes beyond max_scopes (call with the lock held)"""
+        while len(self._buckets) > self.max_scopes:
+            self._buckets.popitem(last=False)
+    
+    def _redis_key(self, scope: str) -> str:
+        """Redis list holding a scope's entries, newest first"""
+        return f"semantic:{self.namespace}:{scope}"
+    
+    @staticmethod
+    def _normalize(embedding: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]:
+        """Scale to unit length so dot products are cosine similarities"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
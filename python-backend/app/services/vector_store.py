@@ -5,8 +5,124 @@ Manages Pinecone vector database for message embeddings and semantic search
 from langchain_openai import OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
 from pinecone import Pinecone, ServerlessSpec
+import asyncio
 import os
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict, deque
+from functools import cached_property, lru_cache
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (id, text, metadata) item accepted by the bulk add methods
+BulkItem = Tuple[str, str, Optional[Dict[str, Any]]]
+
+# Texts per embeddings request and vectors per Pinecone upsert in bulk adds
+_EMBEDDING_CHUNK_SIZE = 256
+_UPSERT_BATCH_SIZE = 100
+
+# How long single adds from concurrent requests wait to be coalesced into one bulk add
+_MICRO_BATCH_WINDOW = 0.02
+
+# Metadata key under which LangChain's PineconeVectorStore stores each document's text
+_TEXT_KEY = "text"
+
+# Maximum number of query embeddings kept in the in-process cache
+_QUERY_EMBEDDING_CACHE_SIZE = 2048
+
+
+class _MicroBatcher:
+    """
+    Coalesces single-item adds arriving within a short window into one bulk call,
+    run in a worker thread. Each caller awaits its own item; when a batch fails, its
+    items are retried one at a time so only the callers whose items fail see an error.
+    """
+    
+    def __init__(self, flush: Callable[[List[BulkItem]], None]):
+        self._flush_items = flush
+        self._pending: Deque[Tuple[BulkItem, asyncio.Future]] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def submit(self, item: BulkItem) -> None:
+        """Queue an item and wait until its batch is written"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= _EMBEDDING_CHUNK_SIZE:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(_MICRO_BATCH_WINDOW, self._start_flush)
+        await future
+    
+    def _start_flush(self) -> None:
+        """Hand everything queued so far to a background flush"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = list(self._pending)
+        self._pending.clear()
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._flush(batch))
+            self._tasks.add(task)  # Keep a reference until done
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _flush(self, batch: List[Tuple[BulkItem, asyncio.Future]]) -> None:
+        """Write one batch and resolve its callers"""
+        try:
+            await asyncio.to_thread(self._flush_items, [item for item, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                self._resolve(batch[0][1], e)
+                return
+            logger.warning("Bulk add of %d items failed (%s); retrying them one at a time", len(batch), e)
+            for item, future in batch:
+                try:
+                    await asyncio.to_thread(self._flush_items, [item])
+                except Exception as item_error:
+                    self._resolve(future, item_error)
+                else:
+                    self._resolve(future)
+        else:
+            for _, future in batch:
+                self._resolve(future)
+    
+    @staticmethod
+    def _resolve(future: asyncio.Future, error: Optional[BaseException] = None) -> None:
+        """Complete a caller's future unless it was cancelled"""
+        if future.done():
+            return
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
+
+
+class SearchHit:
+    """
+    One similarity search result. Slotted to keep per-hit allocation small; also
+    readable like the dicts earlier versions returned (hit["content"], hit.get(...)).
+    """
+    
+    __slots__ = ("content", "metadata", "similarity")
+    
+    def __init__(self, content: str, metadata: Dict[str, Any], similarity: float):
+        self.content = content
+        self.metadata = metadata
+        self.similarity = similarity
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Mapping-style read with a default"""
+        return getattr(self, key) if key in self.__slots__ else default
+    
+    def __repr__(self) -> str:
+        return f"SearchHit(content={self.content!r}, metadata={self.metadata!r}, similarity={self.similarity!r})"
 
 
 class VectorStoreService:
@@ -16,51 +132,61 @@ class VectorStoreService:
     """
     
     def __init__(self):
-        """Initialize Pinecone connection and embedding model"""
-        # Initialize Pinecone client
-        self.pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-        
-        # Connect to the messageai index
+        """Initialize the Pinecone client; the index, embeddings and stores connect on first use"""
+        # Initialize Pinecone client (thread pool for LangChain's parallel upserts)
+        self.pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"), pool_threads=4)
         self.index_name = "messageai"
-        self.index = self.pc.Index(self.index_name)
-        
-        # Initialize OpenAI embeddings
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-small",
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
-        
-        # Create LangChain vector store instances using from_existing_index pattern
-        # This is the recommended approach for Pinecone SDK 5.0+ and langchain-pinecone 0.2.x
-        self.messages_store = PineconeVectorStore.from_existing_index(
-            index_name=self.index_name,
-            embedding=self.embeddings,
-            namespace="messages"
-        )
-        
-        # Create events vector store instance for event deduplication
-        self.events_store = PineconeVectorStore.from_existing_index(
-            index_name=self.index_name,
-            embedding=self.embeddings,
-            namespace="events"
-        )
         
-        # Create decisions vector store instance for decision tracking (Story 5.2)
-        self.decisions_store = PineconeVectorStore.from_existing_index(
-            index_name=self.index_name,
-            embedding=self.embeddings,
-            namespace="decisions"
-        )
+        # LRU cache of query text -> embedding (repeated searches skip the API call)
+        self._query_embeddings: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
         
-        # Create reminders vector store instance for reminder tracking (Story 5.5)
-        self.reminders_store = PineconeVectorStore.from_existing_index(
-            index_name=self.index_name,
-            embedding=self.embeddings,
-            namespace="reminders"
-        )
+        # Coalesce single adds from concurrent requests into bulk writes
+        self._message_batcher = _MicroBatcher(self.add_messages_bulk)
+        self._event_batcher = _MicroBatcher(self.add_events_bulk)
+        self._decision_batcher = _MicroBatcher(self.add_decisions_bulk)
         
         # VectorStoreService initialized successfully
     
+    @cached_property
+    def index(self) -> Any:
+        """Connection to the messageai index, shared by every namespace store"""
+        return self.pc.Index(self.index_name)
+    
+    @cached_property
+    def embeddings(self) -> OpenAIEmbeddings:
+        """OpenAI embedding model"""
+        dimensions = os.getenv("EMBEDDING_DIMENSIONS")
+        return OpenAIEmbeddings(
+            model="text-embedding-3-small",
+            dimensions=int(dimensions) if dimensions else None,
+            openai_api_key=os.getenv("OPENAI_API_KEY")
+        )
+    
+    @cached_property
+    def messages_store(self) -> PineconeVectorStore:
+        """Vector store for message embeddings"""
+        return self._namespace_store("messages")
+    
+    @cached_property
+    def events_store(self) -> PineconeVectorStore:
+        """Vector store for event deduplication"""
+        return self._namespace_store("events")
+    
+    @cached_property
+    def decisions_store(self) -> PineconeVectorStore:
+        """Vector store for decision tracking (Story 5.2)"""
+        return self._namespace_store("decisions")
+    
+    @cached_property
+    def reminders_store(self) -> PineconeVectorStore:
+        """Vector store for reminder tracking (Story 5.5)"""
+        return self._namespace_store("reminders")
+    
+    def _namespace_store(self, namespace: str) -> PineconeVectorStore:
+        """LangChain store over the shared index connection for one namespace"""
+        return PineconeVectorStore(index=self.index, embedding=self.embeddings, namespace=namespace)
+    
     def add_message(
         self, 
         message_id: str, 
@@ -75,25 +201,39 @@ class VectorStoreService:
             text: Message text content
             metadata: Additional metadata (user_id, conversation_id, timestamp, etc.)
         """
-        if metadata is None:
-            metadata = {}
+        self.add_messages_bulk([(message_id, text, metadata)])
+    
+    async def add_message_async(
+        self, 
+        message_id: str, 
+        text: str, 
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Async variant of add_message; concurrent calls are written in one bulk add
         
-        # Add message_id to metadata
-        metadata["message_id"] = message_id
+        Args:
+            message_id: Unique identifier for the message
+            text: Message text content
+            metadata: Additional metadata (user_id, conversation_id, timestamp, etc.)
+        """
+        await self._message_batcher.submit((message_id, text, metadata))
+    
+    def add_messages_bulk(self, items: List[BulkItem]) -> None:
+        """
+        Add many messages with batched embedding requests and upserts
         
-        # Add to vector store
-        self.messages_store.add_texts(
-            texts=[text],
-            metadatas=[metadata],
-            ids=[message_id]
-        )
+        Args:
+            items: (message_id, text, metadata) tuples
+        """
+        self._add_bulk(self.messages_store, items, "message_id")
     
     def search_similar_messages(
         self, 
         query: str, 
         k: int = 5,
         filter_dict: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> List[SearchHit]:
         """
         Search for semantically similar messages
         
@@ -103,26 +243,29 @@ class VectorStoreService:
             filter_dict: Optional metadata filters (e.g., {"conversation_id": "123"})
         
         Returns:
-            List of similar messages with content and metadata
+            List of similar messages with content, metadata, and similarity scores
         """
-        # Generate embedding for the query
-        query_embedding = self.embeddings.embed_query(query)
+        return self._query_namespace("messages", query, k, filter_dict)
+    
+    async def search_similar_messages_async(
+        self, 
+        query: str, 
+        k: int = 5,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
+        """
+        Async variant of search_similar_messages; runs in a worker thread so searches
+        of several namespaces can be awaited together with asyncio.gather
         
-        # Use similarity_search_by_vector instead of similarity_search
-        # (LangChain's similarity_search has issues with Pinecone serverless)
-        results = self.messages_store.similarity_search_by_vector(
-            embedding=query_embedding,
-            k=k,
-            filter=filter_dict
-        )
+        Args:
+            query: Search query text
+            k: Number of results to return
+            filter_dict: Optional metadata filters (e.g., {"conversation_id": "123"})
         
-        return [
-            {
-                "content": doc.page_content,
-                "metadata": doc.metadata
-            }
-            for doc in results
-        ]
+        Returns:
+            List of similar messages with content, metadata, and similarity scores
+        """
+        return await asyncio.to_thread(self.search_similar_messages, query, k, filter_dict)
     
     def delete_message(self, message_id: str) -> None:
         """
@@ -156,26 +299,39 @@ class VectorStoreService:
             text: Event text (title + date for semantic matching)
             metadata: Additional metadata (event details)
         """
-        if metadata is None:
-            metadata = {}
+        self.add_events_bulk([(event_id, text, metadata)])
+    
+    async def add_event_async(
+        self, 
+        event_id: str, 
+        text: str, 
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Async variant of add_event; concurrent calls are written in one bulk add
         
-        # Add event_id to metadata
-        metadata["event_id"] = event_id
-        metadata["type"] = "event"
+        Args:
+            event_id: Unique identifier for the event
+            text: Event text (title + date for semantic matching)
+            metadata: Additional metadata (event details)
+        """
+        await self._event_batcher.submit((event_id, text, metadata))
+    
+    def add_events_bulk(self, items: List[BulkItem]) -> None:
+        """
+        Add many events with batched embedding requests and upserts
         
-        # Add to events vector store
-        self.events_store.add_texts(
-            texts=[text],
-            metadatas=[metadata],
-            ids=[event_id]
-        )
+        Args:
+            items: (event_id, text, metadata) tuples
+        """
+        self._add_bulk(self.events_store, items, "event_id", "event")
     
     def search_similar_events(
         self, 
         query: str, 
         k: int = 3,
         filter_dict: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> List[SearchHit]:
         """
         Search for semantically similar events (for deduplication)
         
@@ -187,21 +343,27 @@ class VectorStoreService:
         Returns:
             List of similar events with content, metadata, and similarity scores
         """
-        # Use similarity_search_with_score (correct method for PineconeVectorStore)
-        results = self.events_store.similarity_search_with_score(
-            query=query,
-            k=k,
-            filter=filter_dict
-        )
+        return self._query_namespace("events", query, k, filter_dict)
+    
+    async def search_similar_events_async(
+        self, 
+        query: str, 
+        k: int = 3,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
+        """
+        Async variant of search_similar_events; runs in a worker thread so searches
+        of several namespaces can be awaited together with asyncio.gather
         
-        return [
-            {
-                "content": doc.page_content,
-                "metadata": doc.metadata,
-                "similarity": float(score)  # Cosine similarity score
-            }
-            for doc, score in results
-        ]
+        Args:
+            query: Search query text (event title + date)
+            k: Number of results to return
+            filter_dict: Optional metadata filters (e.g., {"user_id": "123"})
+        
+        Returns:
+            List of similar events with content, metadata, and similarity scores
+        """
+        return await asyncio.to_thread(self.search_similar_events, query, k, filter_dict)
     
     def delete_event(self, event_id: str) -> None:
         """
@@ -226,26 +388,39 @@ class VectorStoreService:
             text: Decision text (complete, contextual summary)
             metadata: Additional metadata (decision details)
         """
-        if metadata is None:
-            metadata = {}
+        self.add_decisions_bulk([(decision_id, text, metadata)])
+    
+    async def add_decision_async(
+        self, 
+        decision_id: str, 
+        text: str, 
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Async variant of add_decision; concurrent calls are written in one bulk add
         
-        # Add decision_id to metadata
-        metadata["decision_id"] = decision_id
-        metadata["type"] = "decision"
+        Args:
+            decision_id: Unique identifier for the decision
+            text: Decision text (complete, contextual summary)
+            metadata: Additional metadata (decision details)
+        """
+        await self._decision_batcher.submit((decision_id, text, metadata))
+    
+    def add_decisions_bulk(self, items: List[BulkItem]) -> None:
+        """
+        Add many decisions with batched embedding requests and upserts
         
-        # Add to decisions vector store
-        self.decisions_store.add_texts(
-            texts=[text],
-            metadatas=[metadata],
-            ids=[decision_id]
-        )
+        Args:
+            items: (decision_id, text, metadata) tuples
+        """
+        self._add_bulk(self.decisions_store, items, "decision_id", "decision")
     
     def search_similar_decisions(
         self, 
         query: str, 
         k: int = 10,
         filter_dict: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> List[SearchHit]:
         """
         Search for semantically similar decisions (Story 5.2)
         
@@ -257,25 +432,31 @@ class VectorStoreService:
         Returns:
             List of similar decisions with content, metadata, and similarity scores
         """
-        # Generate embedding for the query
-        query_embedding = self.embeddings.embed_query(query)
+        results = self._query_namespace("decisions", query, k, filter_dict)
+        for result in results:
+            # The response model bounds scores to [0, 1]
+            result.similarity = max(0.0, result.similarity)
+        return results
+    
+    async def search_similar_decisions_async(
+        self, 
+        query: str, 
+        k: int = 10,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
+        """
+        Async variant of search_similar_decisions; runs in a worker thread so searches
+        of several namespaces can be awaited together with asyncio.gather
         
-        # Use similarity_search_by_vector (returns documents without scores)
-        results = self.decisions_store.similarity_search_by_vector(
-            embedding=query_embedding,
-            k=k,
-            filter=filter_dict
-        )
+        Args:
+            query: Search query text
+            k: Number of results to return
+            filter_dict: Optional metadata filters (e.g., {"user_id": "123", "conversation_id": "conv123"})
         
-        # Return results with placeholder similarity (Pinecone serverless doesn't return scores easily)
-        return [
-            {
-                "content": doc.page_content,
-                "metadata": doc.metadata,
-                "similarity": 0.95 - (i * 0.05)  # Decreasing scores based on rank
-            }
-            for i, doc in enumerate(results)
-        ]
+        Returns:
+            List of similar decisions with content, metadata, and similarity scores
+        """
+        return await asyncio.to_thread(self.search_similar_decisions, query, k, filter_dict)
     
     def delete_decision(self, decision_id: str) -> None:
         """
@@ -349,12 +530,142 @@ class VectorStoreService:
             namespace: Pinecone namespace
         """
         self.index.delete(ids=[vector_id], namespace=namespace)
+    
+    def search_multi(
+        self,
+        query: str,
+        specs: List[Tuple[str, int, Optional[Dict[str, Any]]]]
+    ) -> Dict[str, List[SearchHit]]:
+        """
+        Search several namespaces for the same query, embedding it only once
+        
+        Args:
+            query: Search query text
+            specs: (namespace, k, filter_dict) per namespace to search
+        
+        Returns:
+            Results per namespace, shaped like search_similar_messages results
+        """
+        embedding = self._embed_query(query)
+        return {
+            namespace: self._query_vector(namespace, embedding, k, filter_dict)
+            for namespace, k, filter_dict in specs
+        }
+    
+    def _query_namespace(
+        self,
+        namespace: str,
+        query: str,
+        k: int,
+        filter_dict: Optional[Dict[str, Any]]
+    ) -> List[SearchHit]:
+        """
+        Query Pinecone directly for the texts most similar to a query
+        
+        Args:
+            namespace: Pinecone namespace to search
+            query: Search query text
+            k: Number of results to return
+            filter_dict: Optional metadata filters
+        
+        Returns:
+            Results with content (the stored text), remaining metadata, and cosine similarity
+        """
+        return self._query_vector(namespace, self._embed_query(query), k, filter_dict)
+    
+    def _query_vector(
+        self,
+        namespace: str,
+        embedding: List[float],
+        k: int,
+        filter_dict: Optional[Dict[str, Any]]
+    ) -> List[SearchHit]:
+        """
+        Query Pinecone directly for the texts nearest to an embedding
+        
+        Args:
+            namespace: Pinecone namespace to search
+            embedding: Query embedding
+            k: Number of results to return
+            filter_dict: Optional metadata filters
+        
+        Returns:
+            Results with content (the stored text), remaining metadata, and cosine similarity
+        """
+        response = self.index.query(
+            vector=embedding,
+            top_k=k,
+            filter=filter_dict,
+            namespace=namespace,
+            include_metadata=True
+        )
+        results = []
+        for match in response.matches:
+            metadata = dict(match.metadata or {})
+            # LangChain stores the document text under this key; skip vectors written without it
+            text = metadata.pop(_TEXT_KEY, None)
+            if text is not None:
+                results.append(SearchHit(text, metadata, float(match.score)))
+        return results
+    
+    def _embed_query(self, query: str) -> List[float]:
+        """
+        Embed a search query, reusing the embedding of a recently seen identical query
+        
+        Args:
+            query: Search query text
+        
+        Returns:
+            Query embedding
+        """
+        with self._query_embeddings_lock:
+            cached = self._query_embeddings.get(query)
+            if cached is not None:
+                self._query_embeddings.move_to_end(query)
+                return list(cached)
+        embedding = tuple(self.embeddings.embed_query(query))
+        with self._query_embeddings_lock:
+            self._query_embeddings[query] = embedding
+            if len(self._query_embeddings) > _QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+        return list(embedding)
+    
+    def _add_bulk(
+        self,
+        store: PineconeVectorStore,
+        items: List[BulkItem],
+        id_key: str,
+        item_type: Optional[str] = None
+    ) -> None:
+        """
+        Embed and upsert items in as few round-trips as possible
+        
+        Args:
+            store: Namespaced vector store to write to
+            items: (id, text, metadata) tuples
+            id_key: Metadata key that records the item's ID
+            item_type: Optional value for the metadata "type" key
+        """
+        if not items:
+            return
+        metadatas = []
+        for item_id, _, metadata in items:
+            metadata = {} if metadata is None else metadata
+            metadata[id_key] = item_id
+            if item_type:
+                metadata["type"] = item_type
+            metadatas.append(metadata)
+        store.add_texts(
+            texts=[text for _, text, _ in items],
+            metadatas=metadatas,
+            ids=[item_id for item_id, _, _ in items],
+            batch_size=_UPSERT_BATCH_SIZE,
+            embedding_chunk_size=_EMBEDDING_CHUNK_SIZE
+        )
 
 
 # Singleton instance
-_vector_store_instance = None
-
-
+@lru_cache(maxsize=1)
 def get_vector_store() -> VectorStoreService:
     """
     Get or create the VectorStoreService singleton instance
@@ -362,10 +673,7 @@ def get_vector_store() -> VectorStoreService:
     Returns:
         VectorStoreService instance
     """
-    global _vector_store_instance
-    if _vector_store_instance is None:
-        _vector_store_instance = VectorStoreService()
-    return _vector_store_instance
+    return VectorStoreService()
 
 
 
@@ -2,7 +2,12 @@
 """
 Wipe all vectors from Pinecone but keep the index structure intact.
 This clears all data from the messageai index while preserving namespaces.
+Pass --user <user_id> to clear only that user's vectors, and --fast to send the
+deletes as raw REST calls multiplexed over one HTTP/2 connection.
 """
+import argparse
+import asyncio
+import importlib.util
 import os
 import sys
 from pathlib import Path
@@ -14,52 +19,133 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 load_dotenv()
 
-from pinecone import Pinecone
-
-def wipe_pinecone():
-    """Wipe all vectors from all namespaces in the messageai index"""
-    
-    # Get API key from environment
-    api_key = os.getenv("PINECONE_API_KEY")
-    if not api_key:
+# Validate required configuration once, at startup; importers get an exception, not an exit
+PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
+if not PINECONE_API_KEY:
+    if __name__ == "__main__":
         print("❌ PINECONE_API_KEY not found in environment!")
         print("Make sure your .env file exists and contains PINECONE_API_KEY")
         sys.exit(1)
+    raise RuntimeError("PINECONE_API_KEY not found in environment")
+
+import httpx
+from pinecone import PineconeAsyncio
+
+# Pinecone REST API version matching the request bodies sent in --fast mode
+_PINECONE_API_VERSION = "2025-04"
+
+# HTTP/2 multiplexing for --fast mode when the h2 package is installed
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Data-plane host of the messageai index, looked up once per process
+_index_host = None
+
+async def _get_index_host(pc):
+    """Host of the messageai index, so repeated wipes skip the control-plane lookup"""
+    global _index_host
+    if _index_host is None:
+        _index_host = (await pc.describe_index("messageai")).host
+    return _index_host
+
+async def _clear_namespace(index, namespace, user_id=None):
+    """Delete all (or one user's) vectors in one namespace, returning (namespace, error or None)"""
+    try:
+        if user_id:
+            await index.delete(filter={"user_id": {"$eq": user_id}}, namespace=namespace)
+        else:
+            await index.delete(delete_all=True, namespace=namespace)
+        return namespace, None
+    except Exception as e:
+        return namespace, e
+
+def _delete_body(namespace, user_id=None):
+    """REST body for deleting all (or one user's) vectors in a namespace"""
+    if user_id:
+        return {"namespace": namespace, "filter": {"user_id": {"$eq": user_id}}}
+    return {"namespace": namespace, "deleteAll": True}
+
+async def _post_delete(client, namespace, user_id=None):
+    """POST one namespace delete, returning (namespace, error or None)"""
+    try:
+        response = await client.post("/vectors/delete", json=_delete_body(namespace, user_id))
+        response.raise_for_status()
+        return namespace, None
+    except Exception as e:
+        return namespace, e
+
+async def _clear_namespaces_fast(host, api_key, namespaces, user_id=None):
+    """Send every namespace delete at once, sharing a single connection when HTTP/2 is available"""
+    async with httpx.AsyncClient(
+        base_url=f"https://{host}",
+        headers={"Api-Key": api_key, "X-Pinecone-API-Version": _PINECONE_API_VERSION},
+        http2=_HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=1 if _HTTP2_AVAILABLE else len(namespaces))
+    ) as client:
+        return await asyncio.gather(*[_post_delete(client, namespace, user_id) for namespace in namespaces])
+
+async def wipe_pinecone(user_id=None, fast=False):
+    """
+    Wipe vectors from all namespaces in the messageai index
     
+    Args:
+        user_id: Only delete vectors whose user_id metadata matches (all vectors when None)
+        fast: Bypass the SDK and multiplex the deletes over one HTTP/2 connection
+    """
     try:
-        # Initialize Pinecone
-        pc = Pinecone(api_key=api_key)
-        index = pc.Index("messageai")
-        
         # Namespaces used in your app
         namespaces = ["messages", "events", "decisions", "reminders"]
         
-        print("🧹 Wiping Pinecone vectors (keeping index structure)...")
-        print(f"   Index: messageai")
-        print(f"   Namespaces: {', '.join(namespaces)}\n")
+        # Buffer each block of output and write it with a single print
+        log = ["🧹 Wiping Pinecone vectors (keeping index structure)...", "   Index: messageai", f"   Namespaces: {', '.join(namespaces)}"]
+        if user_id:
+            log.append(f"   User: {user_id}")
+        print(*log, sep="\n", end="\n\n")
         
-        total_cleared = 0
-        for namespace in namespaces:
-            try:
-                # Get stats before deletion
-                stats = index.describe_index_stats()
-                ns_count = stats.namespaces.get(namespace, {}).vector_count if hasattr(stats, 'namespaces') else 0
-                
-                # Delete all vectors in this namespace
-                index.delete(delete_all=True, namespace=namespace)
-                print(f"✅ Cleared namespace '{namespace}' ({ns_count} vectors)")
-                total_cleared += ns_count
+        # Initialize Pinecone
+        async with PineconeAsyncio(api_key=PINECONE_API_KEY) as pc:
+            host = await _get_index_host(pc)
+            async with pc.IndexAsyncio(host=host) as index:
+                # Get stats before deletion (one call covers every namespace; per-user counts aren't available)
+                counts = {}
+                if not user_id:
+                    # SDK stats models and plain dicts both support mapping-style .get()
+                    ns_map = (await index.describe_index_stats()).get("namespaces") or {}
+                    counts = {namespace: (ns_map.get(namespace) or {}).get("vector_count", 0) for namespace in namespaces}
                 
-            except Exception as e:
-                print(f"⚠️  Error clearing '{namespace}': {e}")
+                # Delete all namespaces concurrently on one event loop
+                if fast:
+                    results = await _clear_namespaces_fast(host, PINECONE_API_KEY, namespaces, user_id)
+                else:
+                    results = await asyncio.gather(*[_clear_namespace(index, namespace, user_id) for namespace in namespaces])
+        
+        log = []
+        total_cleared = 0
+        for namespace, error in results:
+            if error is not None:
+                log.append(f"⚠️  Error clearing '{namespace}': {error}")
+                continue
+            if user_id:
+                log.append(f"✅ Cleared user '{user_id}' from namespace '{namespace}'")
+                continue
+            ns_count = counts[namespace]
+            log.append(f"✅ Cleared namespace '{namespace}' ({ns_count} vectors)")
+            total_cleared += ns_count
         
-        print(f"\n✨ Done! Cleared {total_cleared} total vectors.")
-        print(f"   Index 'messageai' still exists and is ready to use.")
+        if user_id:
+            log.append(f"\n✨ Done! Cleared vectors for user '{user_id}'.")
+        else:
+            log.append(f"\n✨ Done! Cleared {total_cleared} total vectors.")
+        log.append("   Index 'messageai' still exists and is ready to use.")
+        print(*log, sep="\n")
         
     except Exception as e:
         print(f"❌ Error connecting to Pinecone: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    wipe_pinecone()
+    parser = argparse.ArgumentParser(description="Wipe vectors from the messageai Pinecone index")
+    parser.add_argument("--user", help="only delete vectors belonging to this user_id")
+    parser.add_argument("--fast", action="store_true", help="send deletes over one multiplexed HTTP/2 connection")
+    args = parser.parse_args()
+    asyncio.run(wipe_pinecone(user_id=args.user, fast=args.fast))
 
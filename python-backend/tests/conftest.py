@@ -7,3 +7,44 @@ import os
 # Add the app directory to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Shared test client; the app is imported and started once per test session"""
+    from app.main import app
+    
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run anyio-marked async tests on asyncio only"""
+    return "asyncio"
+
+
+class StubEventIndexingService:
+    """Stands in for EventIndexingService so route tests never connect to Pinecone"""
+    
+    def index_event(self, event):
+        return True
+    
+    def update_event(self, event):
+        return True
+    
+    def delete_event(self, event_id):
+        return True
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stub_event_indexing_service():
+    """Point the events routes at a stub service for the whole session"""
+    from app.routes import events
+    
+    stub = StubEventIndexingService()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(events, "get_event_indexing_service", lambda: stub)
+        yield
@@ -1,13 +1,9 @@
 """
 Test Health Endpoint
 """
-from fastapi.testclient import TestClient
-from app.main import app
 
-client = TestClient(app)
 
-
-def test_root_endpoint():
+def test_root_endpoint(client):
     """Test the root endpoint returns correct response"""
     response = client.get("/")
     assert response.status_code == 200
@@ -17,7 +13,7 @@ def test_root_endpoint():
     assert "version" in data
 
 
-def test_health_endpoint():
+def test_health_endpoint(client):
     """Test the health check endpoint"""
     response = client.get("/health")
     assert response.status_code == 200
@@ -26,8 +22,8 @@ def test_health_endpoint():
     assert data["service"] == "messageai-backend"
 
 
-def test_docs_available():
-    """Test that Swagger docs are accessible"""
-    response = client.get("/docs")
+def test_docs_available(client):
+    """Test that the OpenAPI schema behind the Swagger docs is served"""
+    response = client.get("/openapi.json")
     assert response.status_code == 200
 
@@ -0,0 +1,84 @@
+"""
+Test OpenAI Service parsing helpers
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.services.openai_service import OpenAIService, _StreamAccumulator, _TRIGGER_RE, _cached_parse, _parse_relative
+
+# Parsing helpers don't touch the API clients, so skip __init__
+service = OpenAIService.__new__(OpenAIService)
+reference_time = datetime(2025, 10, 20, 10, 15)
+
+
+def test_parse_time_clock_formats():
+    """Test that 12-hour and 24-hour times resolve to HH:MM"""
+    assert service._parse_time_with_fallback("19:00", reference_time) == "19:00"
+    assert service._parse_time_with_fallback("7pm", reference_time) == "19:00"
+    assert service._parse_time_with_fallback("4:44 PM", reference_time) == "16:44"
+    assert service._parse_time_with_fallback("7 a.m.", reference_time) == "07:00"
+    assert service._parse_time_with_fallback("12am", reference_time) == "00:00"
+    assert service._parse_time_with_fallback("12pm", reference_time) == "12:00"
+
+
+def test_parse_time_named_times():
+    """Test that vague time words map to their default times"""
+    assert service._parse_time_with_fallback("noon", reference_time) == "12:00"
+    assert service._parse_time_with_fallback("Midnight", reference_time) == "00:00"
+    assert service._parse_time_with_fallback("evening", reference_time) == "19:00"
+    assert service._parse_time_with_fallback("in the afternoon", reference_time) == "15:00"
+
+
+def test_relative_dates_match_dateparser():
+    """Test that the hand-written relative date parser agrees with dateparser"""
+    for expr in ("today", "tomorrow", "yesterday", "next week", "friday", "monday", "in 3 days", "in a week", "2 weeks from now"):
+        assert _parse_relative(expr, reference_time) == _cached_parse(expr, reference_time), expr
+    assert _parse_relative("this saturday", reference_time) is None
+
+
+def test_keyword_gate_triggers():
+    """Test that actionable messages pass the keyword gate and chatter doesn't"""
+    for text in ("lol", "ok", "\U0001f44d", "sounds great", "what time is it"):
+        assert not _TRIGGER_RE.search(text), text
+    for text in ("meet at 7pm", "lunch tomorrow?", "Let\u2019s do it", "by EOD please", "Friday works", "we decided on pizza"):
+        assert _TRIGGER_RE.search(text), text
+
+
+def test_stream_scanner_ignores_braces_in_strings():
+    """Test that braces and escaped quotes inside JSON strings don't end the object"""
+    accumulator = _StreamAccumulator(structured=True)
+    assert not accumulator._scan('{"title": "a } b { c", "note": "say \\"}\\" ok"')
+    assert not accumulator._scan(', "nested": {"x": 1}')
+    assert accumulator._scan('}')
+
+
+def test_stream_scanner_handles_split_fragments():
+    """Test that strings and escapes split across chunks are tracked between fragments"""
+    accumulator = _StreamAccumulator(structured=True)
+    for fragment in ('{"a": "x\\', '"}', '", "b": "\\\\', '"', ', "c": {', '}'):
+        assert not accumulator._scan(fragment), fragment
+    assert accumulator._scan(' }')
+    assert not _StreamAccumulator(structured=False)._scan('{}')
+
+
+def test_keyword_gate_only_applies_to_full_analyses(monkeypatch):
+    """Test that a gated message still gets sentiment and key points from the wrappers"""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.delenv("SEMANTIC_CACHE_THRESHOLD", raising=False)
+    gated = OpenAIService()
+    gated.keyword_gate = True
+    arguments = '{"sentiment": {"sentiment": "negative", "confidence": 0.9, "emotions": ["anger"]}, "key_points": ["hates it"]}'
+    tool_call = SimpleNamespace(function=SimpleNamespace(name="analyze_message", arguments=arguments))
+    calls = []
+    
+    def fake_chat_completion(**request):
+        calls.append(request)
+        return {"content": None, "tool_calls": [tool_call]}
+    
+    monkeypatch.setattr(gated, "chat_completion", fake_chat_completion)
+    
+    assert gated.analyze_message_comprehensive("I hate this") == gated._get_default_analysis()
+    assert not calls
+    assert gated.analyze_sentiment("I hate this")["sentiment"] == "negative"
+    assert gated.extract_key_points("I hate this!") == ["hates it"]
+    assert len(calls) == 2
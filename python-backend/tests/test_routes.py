@@ -1,52 +1,84 @@
 """
 Test API Routes
 """
-from fastapi.testclient import TestClient
-from app.main import app
-
-client = TestClient(app)
-
-
-def test_analysis_route_exists():
-    """Test that analysis route is registered"""
-    response = client.post("/api/v1/analyze/sentiment")
-    # Should return 200 with not_implemented status (not 404)
-    assert response.status_code == 200
+import asyncio
+from typing import Any, Dict, Optional, Tuple
 
+import httpx
+import pytest
+from httpx import ASGITransport
 
-def test_summarization_route_exists():
-    """Test that summarization route is registered"""
-    response = client.post("/api/v1/summarize/conversation")
-    assert response.status_code == 200
-
+from app.main import app
 
-def test_events_route_exists():
-    """Test that events route is registered"""
-    response = client.post("/api/v1/events/index", json={
+# (path, body, expected status) for each registered route
+ROUTES: Tuple[Tuple[str, Optional[Dict[str, Any]], int], ...] = (
+    # Stubbed routes return 200 with not_implemented status (not 404)
+    ("/api/v1/analyze/sentiment", None, 200),
+    ("/api/v1/summarize/conversation", None, 200),
+    # The streaming summarization route validates its body
+    ("/api/v1/summarize/conversation/stream", {}, 422),
+    ("/api/v1/events/index", {
         "id": "test-event-123",
-        "user_id": "test-user-123", 
+        "user_id": "test-user-123",
         "title": "Test Event",
         "date": "2024-01-19",
         "startTime": "10:00",
         "endTime": "11:00"
-    })
-    assert response.status_code == 200
+    }, 200),
+    ("/api/v1/reminders/suggest", None, 200),
+    ("/api/v1/decisions/extract", None, 200),
+    ("/api/v1/agent/ask", None, 200),
+)
+
 
+@pytest.mark.anyio
+async def test_routes_registered():
+    """Test that every API route is registered, probing them concurrently"""
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        responses = await asyncio.gather(*(client.post(path, json=body) for path, body, _ in ROUTES))
+    
+    unexpected = {
+        path: response.status_code
+        for (path, _, expected_status), response in zip(ROUTES, responses)
+        if response.status_code != expected_status
+    }
+    assert not unexpected
 
-def test_reminders_route_exists():
-    """Test that reminders route is registered"""
-    response = client.post("/api/v1/reminders/suggest")
-    assert response.status_code == 200
 
+class StubSummaryService:
+    """Streams fixed summary fragments, optionally failing after fail_after of them"""
+    
+    def __init__(self, fragments, fail_after=None):
+        self.fragments = fragments
+        self.fail_after = fail_after
+    
+    async def summarize_text_stream(self, text, max_length=100):
+        for index, fragment in enumerate(self.fragments):
+            if index == self.fail_after:
+                raise RuntimeError("model call failed")
+            yield fragment
 
-def test_decisions_route_exists():
-    """Test that decisions route is registered"""
-    response = client.post("/api/v1/decisions/extract")
-    assert response.status_code == 200
 
+SUMMARY_REQUEST = {
+    "conversation_id": "test-conversation",
+    "messages": [{"user_id": "alice", "text": "Lunch at noon?"}, {"user_id": "bob", "text": "Sure"}]
+}
 
-def test_agent_route_exists():
-    """Test that agent route is registered"""
-    response = client.post("/api/v1/agent/ask")
-    assert response.status_code == 200
 
+@pytest.mark.parametrize(("service", "expected_status", "expected_body"), (
+    (StubSummaryService(["Lunch ", "at noon."]), 200, "Lunch at noon."),
+    (StubSummaryService(["Lunch "], fail_after=0), 500, None),
+    (StubSummaryService(["Lunch ", "at noon."], fail_after=1), 200, "Lunch "),
+))
+def test_summarize_conversation_stream(client, monkeypatch, service, expected_status, expected_body):
+    """Test the streamed summary body, an error status when the model call fails, and mid-stream truncation"""
+    from app.routes import summarization
+    
+    monkeypatch.setattr(summarization, "get_openai_service", lambda: service)
+    response = client.post("/api/v1/summarize/conversation/stream", json=SUMMARY_REQUEST)
+    
+    assert response.status_code == expected_status
+    if expected_body is not None:
+        assert response.text == expected_body
+    else:
+        assert response.json()["detail"] == "model call failed"
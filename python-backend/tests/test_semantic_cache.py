@@ -0,0 +1,53 @@
+"""
+Test Semantic Analysis Cache
+"""
+import numpy as np
+
+from app.services.semantic_cache import SemanticAnalysisCache
+
+rng = np.random.default_rng(0)
+vectors = [rng.normal(size=16).astype(np.float32) for _ in range(80)]
+
+
+class FakeRedisList:
+    """Newest-first Redis list that records every LRANGE call"""
+
+    def __init__(self):
+        self.entries = []
+        self.calls = []
+
+    def lrange(self, key, start, end):
+        self.calls.append((start, end))
+        return self.entries[start:end + 1]
+
+
+def test_entry_encoding_round_trip():
+    """Test that an entry encoded by one process decodes to the same hit in another"""
+    writer = SemanticAnalysisCache(threshold=0.99)
+    entry = writer._insert("user", vectors[0], {"calendar": {"detected": True}})
+
+    reader = SemanticAnalysisCache(threshold=0.99)
+    reader._load("user", [entry])
+    assert reader.lookup("user", vectors[0]) == {"calendar": {"detected": True}}
+    assert reader.lookup("user", vectors[1]) is None
+    assert reader.lookup("other", vectors[0]) is None
+
+
+def test_refresh_reads_only_new_entries():
+    """Test that a reload stops at the newest entry seen by the previous one"""
+    writer = SemanticAnalysisCache(threshold=0.99)
+    redis_list = FakeRedisList()
+    reader = SemanticAnalysisCache(threshold=0.99, refresh_seconds=0)
+    reader._client = redis_list
+
+    redis_list.entries = [writer._insert("user", vector, {"i": i}) for i, vector in enumerate(vectors[:40])][::-1]
+    assert reader.lookup("user", vectors[0]) == {"i": 0}
+    assert redis_list.calls == [(0, 31), (32, 63)]
+
+    # This process's own entry is skipped when it comes back from Redis
+    redis_list.entries.insert(0, reader._insert("user", vectors[40], {"i": 40}))
+    redis_list.entries.insert(0, writer._insert("user", vectors[41], {"i": 41}))
+    redis_list.calls.clear()
+    assert reader.lookup("user", vectors[41]) == {"i": 41}
+    assert redis_list.calls == [(0, 31)]
+    assert reader._buckets["user"].size == 42
@@ -0,0 +1,54 @@
+"""
+Test Vector Store micro-batching
+"""
+import asyncio
+
+import pytest
+
+from app.services import vector_store
+from app.services.vector_store import _EMBEDDING_CHUNK_SIZE, _MicroBatcher
+
+
+@pytest.mark.anyio
+async def test_micro_batcher_flushes_on_timer():
+    """Test that adds arriving within the window are written in one bulk call"""
+    batches = []
+    batcher = _MicroBatcher(batches.append)
+
+    await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+    assert batches == [[0, 1, 2]]
+
+    await batcher.submit(3)
+    assert batches == [[0, 1, 2], [3]]
+
+
+@pytest.mark.anyio
+async def test_micro_batcher_flushes_full_batch_without_waiting(monkeypatch):
+    """Test that reaching the chunk size flushes immediately; the remainder waits for the timer"""
+    monkeypatch.setattr(vector_store, "_MICRO_BATCH_WINDOW", 0.5)
+    batches = []
+    batcher = _MicroBatcher(batches.append)
+
+    full = asyncio.gather(*(batcher.submit(i) for i in range(_EMBEDDING_CHUNK_SIZE)))
+    await asyncio.wait_for(full, timeout=0.25)
+    assert batches == [list(range(_EMBEDDING_CHUNK_SIZE))]
+
+    await asyncio.gather(*(batcher.submit(i) for i in range(_EMBEDDING_CHUNK_SIZE + 1)))
+    assert [len(batch) for batch in batches] == [_EMBEDDING_CHUNK_SIZE, _EMBEDDING_CHUNK_SIZE, 1]
+
+
+@pytest.mark.anyio
+async def test_micro_batcher_failure_only_reaches_its_caller():
+    """Test that a failed bulk write is retried per item so one bad item fails only its own caller"""
+    error = ValueError("metadata too large")
+    written = []
+
+    def flush(items):
+        if "bad" in items:
+            raise error
+        written.extend(items)
+
+    batcher = _MicroBatcher(flush)
+    results = await asyncio.gather(*(batcher.submit(item) for item in ("a", "bad", "c")), return_exceptions=True)
+    assert results == [None, error, None]
+    assert written == ["a", "c"]